@@ -0,0 +1,190 @@
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from logic import *
+
+# Ratio of clauses to symbols at which random 3-SAT is hardest
+RATIO = 4.26
+
+# Most symbols given to each backend that can take exponential time on
+# random knowledge
+LIMITS = {
+    "enumerate": 24,
+    "parallel": 24,
+    "bitwise": 20,
+    "bdd": 36,
+}
+
+KNIGHTS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "..", "..", "project", "knights", "puzzle.py")
+
+
+def main():
+    if len(sys.argv) not in [1, 2]:
+        sys.exit("Usage: python benchmark.py [output]")
+    results = benchmark()
+    text = json.dumps(results, indent=4)
+    if len(sys.argv) == 2:
+        with open(sys.argv[1], "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def revision():
+    """
+    Returns the git commit of the code being benchmarked, or None if it is
+    not in a git repository.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True,
+            text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def random_ksat(n, k=3, ratio=RATIO, seed=None):
+    """
+    Returns a conjunction of `ratio * n` random clauses, each a disjunction
+    of `k` literals over `n` symbols.
+    """
+    rng = random.Random(seed)
+    symbols = [Symbol(f"x{i}") for i in range(n)]
+    knowledge = And()
+    for _ in range(round(ratio * n)):
+        knowledge.add(Or(*[
+            symbol if rng.random() < 0.5 else Not(symbol)
+            for symbol in rng.sample(symbols, k)
+        ]))
+    return knowledge, symbols
+
+
+def pigeonhole(n):
+    """
+    Returns the sentence that `n + 1` pigeons each sit in one of `n`
+    holes, no two in the same hole, which is false.
+    """
+    knowledge = And()
+    for pigeon in range(n + 1):
+        knowledge.add(Or(*[Symbol(f"p{pigeon}h{hole}") for hole in range(n)]))
+    for hole in range(n):
+        for first in range(n + 1):
+            for second in range(first + 1, n + 1):
+                knowledge.add(Not(And(Symbol(f"p{first}h{hole}"),
+                                      Symbol(f"p{second}h{hole}"))))
+    return knowledge
+
+
+def queens(n):
+    """
+    Returns the sentence that `n` queens on an `n` by `n` board attack no
+    other queen, with one symbol for each square.
+    """
+    squares = [[Symbol(f"q{row}_{column}") for column in range(n)]
+               for row in range(n)]
+    knowledge = And()
+    for i in range(n):
+        knowledge.add(ExactlyOne(*squares[i]))
+        knowledge.add(AtMostK(1, *[squares[row][i] for row in range(n)]))
+    for total in range(2 * n - 1):
+        diagonal = [squares[row][total - row] for row in range(n)
+                    if 0 <= total - row < n]
+        knowledge.add(AtMostK(1, *diagonal))
+        antidiagonal = [squares[row][row - total + n - 1] for row in range(n)
+                        if 0 <= row - total + n - 1 < n]
+        knowledge.add(AtMostK(1, *antidiagonal))
+    return knowledge, [symbol for row in squares for symbol in row]
+
+
+def workloads():
+    """
+    Returns a dictionary mapping the name of each workload to a tuple
+    `(knowledge, queries)`.
+    """
+    import clue
+    import mastermind
+    import puzzle
+
+    loads = {}
+    for n in (12, 20, 40):
+        knowledge, symbols = random_ksat(n, seed=n)
+        loads[f"3sat-{n}"] = (knowledge, [Or()] + symbols[:4])
+    for n in (4, 5):
+        loads[f"pigeonhole-{n}"] = (pigeonhole(n), [Or()])
+    for n in (4, 6):
+        knowledge, symbols = queens(n)
+        loads[f"queens-{n}"] = (knowledge, symbols[:n])
+    loads["clue"] = (clue.knowledge.knowledge, clue.symbols)
+    loads["mastermind"] = (mastermind.knowledge, mastermind.symbols)
+    loads["houses"] = (puzzle.knowledge, puzzle.symbols)
+
+    if os.path.exists(KNIGHTS):
+        spec = importlib.util.spec_from_file_location("knights", KNIGHTS)
+        knights = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(knights)
+        symbols = [knights.AKnight, knights.AKnave, knights.BKnight,
+                   knights.BKnave, knights.CKnight, knights.CKnave]
+        for i in range(4):
+            loads[f"knights-{i}"] = (getattr(knights, f"knowledge{i}"),
+                                     symbols)
+    return loads
+
+
+def benchmark():
+    """
+    Time every backend in `BACKENDS` on every workload, one query at a
+    time and, for those in `BATCH_BACKENDS`, all at once, and check that
+    they agree.
+
+    Return a dictionary of results that can be written as JSON.
+    """
+    loads = {}
+    results = {
+        "commit": revision(),
+        "python": platform.python_version(),
+        "backends": list(BACKENDS),
+        "workloads": loads,
+    }
+    for name, (knowledge, queries) in workloads().items():
+        size = len(set.union(knowledge.symbols(),
+                             *[query.symbols() for query in queries]))
+        seconds = {}
+        batch_seconds = {}
+        answers = {}
+        for method in BACKENDS:
+            if size > LIMITS.get(method, size):
+                seconds[method] = None
+                if method in BATCH_BACKENDS:
+                    batch_seconds[method] = None
+                continue
+            started = time.perf_counter()
+            answers[method] = [model_check(knowledge, query, method=method)
+                               for query in queries]
+            seconds[method] = time.perf_counter() - started
+            if method in BATCH_BACKENDS:
+                started = time.perf_counter()
+                answers[f"{method}-batch"] = model_check_many(
+                    knowledge, queries, method=method
+                )
+                batch_seconds[method] = time.perf_counter() - started
+        loads[name] = {
+            "symbols": size,
+            "queries": len(queries),
+            "entailed": sum(next(iter(answers.values()))),
+            "agree": len(set(map(tuple, answers.values()))) == 1,
+            "seconds": seconds,
+            "batch_seconds": batch_seconds,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -11,4 +11,10 @@ knowledge = And(
     dumbledore
 )
 
-print(model_check(knowledge, rain))
+
+def main():
+    print(model_check(knowledge, rain))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,41 +8,25 @@ for i in range(4):
 
 knowledge = And()
 
-# Each color has a position.
+# Each color has exactly one position.
 for color in colors:
-    knowledge.add(Or(
+    knowledge.add(ExactlyOne(
         Symbol(f"{color}0"),
         Symbol(f"{color}1"),
         Symbol(f"{color}2"),
         Symbol(f"{color}3")
     ))
 
-# Only one position per color.
-for color in colors:
-    for i in range(4):
-        for j in range(4):
-            if i != j:
-                knowledge.add(Implication(
-                    Symbol(f"{color}{i}"), Not(Symbol(f"{color}{j}"))
-                ))
-
-# Only one color per position.
+# Each position has exactly one color.
 for i in range(4):
-    for c1 in colors:
-        for c2 in colors:
-            if c1 != c2:
-                knowledge.add(Implication(
-                    Symbol(f"{c1}{i}"), Not(Symbol(f"{c2}{i}"))
-                ))
-
-knowledge.add(Or(
-    And(Symbol("red0"), Symbol("blue1"), Not(Symbol("green2")), Not(Symbol("yellow3"))),
-    And(Symbol("red0"), Symbol("green2"), Not(Symbol("blue1")), Not(Symbol("yellow3"))),
-    And(Symbol("red0"), Symbol("yellow3"), Not(Symbol("blue1")), Not(Symbol("green2"))),
-    And(Symbol("blue1"), Symbol("green2"), Not(Symbol("red0")), Not(Symbol("yellow3"))),
-    And(Symbol("blue1"), Symbol("yellow3"), Not(Symbol("red0")), Not(Symbol("green2"))),
-    And(Symbol("green2"), Symbol("yellow3"), Not(Symbol("red0")), Not(Symbol("blue1")))
-))
+    knowledge.add(ExactlyOne(
+        *[Symbol(f"{color}{i}") for color in colors]
+    ))
+
+# Exactly two of the first guess are right.
+guess = [Symbol("red0"), Symbol("blue1"), Symbol("green2"), Symbol("yellow3")]
+knowledge.add(AtLeastK(2, *guess))
+knowledge.add(AtMostK(2, *guess))
 
 knowledge.add(And(
     Not(Symbol("blue0")),
@@ -51,6 +35,13 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
-for symbol in symbols:
-    if model_check(knowledge, symbol):
-        print(symbol)
+
+def main():
+    entailed = model_check_many(knowledge, symbols)
+    for symbol, known in zip(symbols, entailed):
+        if known:
+            print(symbol)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,32 +11,20 @@ for person in people:
     for house in houses:
         symbols.append(Symbol(f"{person}{house}"))
 
-# Each person belongs to a house.
+# Each person belongs to exactly one house.
 for person in people:
-    knowledge.add(Or(
+    knowledge.add(ExactlyOne(
         Symbol(f"{person}Gryffindor"),
         Symbol(f"{person}Hufflepuff"),
         Symbol(f"{person}Ravenclaw"),
         Symbol(f"{person}Slytherin")
     ))
 
-# Only one house per person.
-for person in people:
-    for h1 in houses:
-        for h2 in houses:
-            if h1 != h2:
-                knowledge.add(
-                    Implication(Symbol(f"{person}{h1}"), Not(Symbol(f"{person}{h2}")))
-                )
-
-# Only one person per house.
+# Each house has exactly one person.
 for house in houses:
-    for p1 in people:
-        for p2 in people:
-            if p1 != p2:
-                knowledge.add(
-                    Implication(Symbol(f"{p1}{house}"), Not(Symbol(f"{p2}{house}")))
-                )
+    knowledge.add(ExactlyOne(
+        *[Symbol(f"{person}{house}") for person in people]
+    ))
 
 knowledge.add(
     Or(Symbol("GilderoyGryffindor"), Symbol("GilderoyRavenclaw"))
@@ -50,6 +38,13 @@ knowledge.add(
     Symbol("MinervaGryffindor")
 )
 
-for symbol in symbols:
-    if model_check(knowledge, symbol):
-        print(symbol)
+
+def main():
+    entailed = model_check_many(knowledge, symbols)
+    for symbol, known in zip(symbols, entailed):
+        if known:
+            print(symbol)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,23 @@
+import re
 import sys
-import copy
 
 from crossword import *
 from queue import Queue
 
+# Bytes of a domain bitset with at least one word in them
+NONZERO = re.compile(rb"[^\x00]")
+
+
+def make_bitset(indices):
+    """
+    Return an integer with bit k set for each k in `indices`.
+    """
+    data = bytearray(max(indices, default=-1) // 8 + 1)
+    for k in indices:
+        data[k >> 3] |= 1 << (k & 7)
+    return int.from_bytes(data, "little")
+
+
 class CrosswordCreator():
 
     def __init__(self, crossword):
@@ -11,11 +25,62 @@ class CrosswordCreator():
         Create new CSP crossword generate.
         """
         self.crossword = crossword
+
+        # Words of each length, and the position of each in its list
+        self.words = dict()
+        for word in sorted(self.crossword.words):
+            self.words.setdefault(len(word), []).append(word)
+        self.indices = {
+            length: {word: k for k, word in enumerate(words)}
+            for length, words in self.words.items()
+        }
+
+        # Bitset of the words of each length with each letter at each
+        # position, as self.letters[length][position][letter]
+        self.letters = dict()
+        for length, words in self.words.items():
+            positions = [dict() for _ in range(length)]
+            for k, word in enumerate(words):
+                for position, letter in enumerate(word):
+                    positions[position].setdefault(letter, []).append(k)
+            self.letters[length] = [
+                {letter: make_bitset(ks) for letter, ks in position.items()}
+                for position in positions
+            ]
+
+        # Each domain is a bitset, with bit k set if it contains word k of
+        # the variable's length
         self.domains = {
-            var: self.crossword.words.copy()
+            var: (1 << len(self.words.get(var.length, []))) - 1
             for var in self.crossword.variables
         }
 
+    def domain_words(self, var):
+        """
+        Return a list of the words in the domain of `var`.
+        """
+        words = self.words.get(var.length, [])
+        bits = self.domains[var]
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+        # Skip to each byte with a bit set, eight words at a time
+        result = []
+        for match in NONZERO.finditer(data):
+            k = 8 * match.start()
+            byte = data[match.start()]
+            while byte:
+                if byte & 1:
+                    result.append(words[k])
+                byte >>= 1
+                k += 1
+        return result
+
+    def domain_size(self, var):
+        """
+        Return the number of words in the domain of `var`.
+        """
+        return self.domains[var].bit_count()
+
     def letter_grid(self, assignment):
         """
         Return 2D array representing a given assignment.
@@ -100,14 +165,11 @@ class CrosswordCreator():
         (Remove any values that are inconsistent with a variable's unary
          constraints; in this case, the length of the word.)
         """
+        # Domains only index words of the variable's length, so clearing
+        # bits past the end of that list is all that is left to do
         for var in self.domains.keys():
-            word_to_remove = set()
             length = var.length
-            for word in self.domains[var]:
-                # Guarantee the word length equals to the blank length
-                if len(word) != length:
-                    word_to_remove.add(word)
-            self.domains[var] -= word_to_remove        
+            self.domains[var] &= (1 << len(self.words.get(length, []))) - 1
 
     def revise(self, x, y):
         """
@@ -118,23 +180,24 @@ class CrosswordCreator():
         Return True if a revision was made to the domain of `x`; return
         False if no revision was made.
         """
-        word_to_remove = set()
         revised = False
         if self.crossword.overlaps[(x, y)] == None:
             return revised
 
+        # Arc consistency: keep the words of x whose letter at the overlap
+        # is the letter of some word of y there
         i, j = self.crossword.overlaps[(x, y)]
-        for word in self.domains[x]:
-            if_exist = False
-            # Arc consistency
-            for another_word in self.domains[y]:
-                if word[i] == another_word[j]:
-                    if_exist = True
-                    break
-            if if_exist == False:
-                word_to_remove.add(word)
-                revised = True
-        self.domains[x] -= word_to_remove        
+        x_letters = self.letters.get(x.length)
+        y_letters = self.letters.get(y.length)
+        supported = 0
+        if x_letters and y_letters:
+            for letter, words in y_letters[j].items():
+                if self.domains[y] & words:
+                    supported |= x_letters[i].get(letter, 0)
+        domain = self.domains[x] & supported
+        if domain != self.domains[x]:
+            self.domains[x] = domain
+            revised = True
         return revised
     
     def ac3(self, arcs=None):
@@ -160,7 +223,7 @@ class CrosswordCreator():
             x, y = q.get()
 
             if self.revise(x, y):
-                if len(self.domains[x]) == 0:
+                if self.domains[x] == 0:
                     # cannot guarantee the arc consistency
                     return False
                 else:
@@ -211,7 +274,7 @@ class CrosswordCreator():
         The first value in the list, for example, should be the one
         that rules out the fewest values among the neighbors of `var`.
         """
-        return sorted(self.domains[var], 
+        return sorted(self.domain_words(var),
                       key = lambda value: self.least_constraining_value(assignment, value, var))
     
     def least_constraining_value(self, assignment, value, var):
@@ -221,12 +284,11 @@ class CrosswordCreator():
             return 0
         else:
             for j in unassigned:
-                if j != var:
-                    for u in self.domains[j]:
-                        if self.crossword.overlaps[(var, j)] != None:
-                            x, y = self.crossword.overlaps[(var, j)]
-                            if value[x] == u[y]:
-                                num += 1
+                if j != var and self.crossword.overlaps[(var, j)] != None:
+                    x, y = self.crossword.overlaps[(var, j)]
+                    if j.length in self.letters:
+                        words = self.letters[j.length][y].get(value[x], 0)
+                        num += (self.domains[j] & words).bit_count()
 
         return num            
     
@@ -239,9 +301,9 @@ class CrosswordCreator():
         return values.
         """
         vars = [i for i in self.domains.keys() if i not in assignment.keys()]
-        vars.sort(key = lambda var: len(self.domains[var]))
-        min_remaining = len(self.domains[vars[0]])
-        min_vars = [var for var in vars if len(self.domains[var]) == min_remaining]
+        vars.sort(key = lambda var: self.domain_size(var))
+        min_remaining = self.domain_size(vars[0])
+        min_vars = [var for var in vars if self.domain_size(var) == min_remaining]
         if len(min_vars) == 1:
             return min_vars[0]
         else:
@@ -271,9 +333,10 @@ class CrosswordCreator():
                 assignment[var] = value
                 if self.consistent(assignment):
 
-                    # Add new inferences if it succeeded
-                    saved = copy.deepcopy(self.domains)
-                    self.domains[var] = {value}
+                    # Add new inferences if it succeeded; domains are
+                    # integers, so a shallow copy saves them all
+                    saved = dict(self.domains)
+                    self.domains[var] = 1 << self.indices[var.length][value]
                     inference = self.ac3()
                     if inference:
                          result = self.backtrack(assignment)
@@ -1,8 +1,47 @@
+import heapq
 import itertools
+import multiprocessing
+import os
+import re
+import weakref
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Symbols whose models each worker checks between looking for a request to
+# stop, so it checks 2 ** CHUNK models at a time
+CHUNK = 12
+
+# Compiled knowledge, query and stop event of a worker process
+_checking = None
+
+# Connectives written by `Sentence.formula`, which split it into tokens
+TOKENS = re.compile(r"(<=>|=>|[¬∧∨(),⊤⊥])")
+
+# Names of cardinality constraints written by `Cardinality.formula`
+CARDINALITIES = re.compile(r"ExactlyOne|AtMost(\d+)|AtLeast(\d+)")
+
+# Symbols whose models are checked in full rather than one at a time, once
+# the others are assigned
+TAIL = 6
+
+# Values in a partial model, ordered so that And is min and Or is max
+FALSE, UNKNOWN, TRUE = 0, 1, 2
+
+# Start of the comment lines naming variables in DIMACS files
+NAME = "c name "
+
+# Result of `simplify`, with the sizes of the sentence before and after
+Simplification = namedtuple("Simplification", ["sentence", "before", "after"])
 
 
 class Sentence():
 
+    __slots__ = ("frozen", "_hash", "_symbols", "__weakref__")
+
+    # Sentences that can never change, shared between equal structures
+    shared = weakref.WeakValueDictionary()
+
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
@@ -13,7 +52,125 @@ class Sentence():
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        return set(self.symbol_set())
+
+    def symbol_set(self):
+        """
+        Returns a frozenset of all symbols in the logical sentence, which
+        is only computed once if the sentence cannot change.
+        """
+        symbols = getattr(self, "_symbols", None)
+        if symbols is None:
+            symbols = frozenset().union(
+                *[child.symbol_set() for child in self.children()]
+            )
+            if self.cacheable():
+                self._symbols = symbols
+        return symbols
+
+    def children(self):
+        """Returns a tuple of the sentences the sentence is built from."""
+        return ()
+
+    def size(self):
+        """Returns the number of symbols and connectives in the sentence."""
+        return 1 + sum(child.size() for child in self.children())
+
+    def cacheable(self):
+        """Returns True if the logical sentence cannot change."""
+        return getattr(self, "frozen", False)
+
+    def __reduce__(self):
+        return (type(self), self.children())
+
+    @classmethod
+    def share(cls, *operands):
+        """
+        Returns a sentence of this class built from `operands`. If none of
+        the operands can change, any sentence already built from the same
+        operands is returned instead of a new one.
+        """
+        frozen = all(
+            getattr(operand, "frozen", False)
+            or not isinstance(operand, Sentence)
+            for operand in operands
+        )
+        key = (cls,) + operands
+        if frozen:
+            sentence = Sentence.shared.get(key)
+            if sentence is not None:
+                return sentence
+        sentence = object.__new__(cls)
+        sentence._setup(*operands)
+        object.__setattr__(sentence, "frozen", frozen)
+        object.__setattr__(sentence, "_hash", None)
+        object.__setattr__(sentence, "_symbols", None)
+        if frozen:
+            hash(sentence)
+            Sentence.shared[key] = sentence
+        return sentence
+
+    def __setattr__(self, name, value):
+        # Shared sentences may be in use anywhere, so only their caches
+        # can be filled in
+        frozen = getattr(self, "frozen", False)
+        if frozen and name not in ("_hash", "_symbols"):
+            raise AttributeError(
+                f"cannot set {name!r} on a shared {type(self).__name__}"
+            )
+        object.__setattr__(self, name, value)
+
+    def expression(self, index):
+        """
+        Returns a Python expression that evaluates the logical sentence on
+        a sequence `v` of truth values, where `index` maps each symbol name
+        to its position in `v`.
+        """
+        raise Exception("nothing to evaluate")
+
+    def compile(self, symbols):
+        """
+        Returns a function that evaluates the logical sentence on a
+        sequence of truth values, where the value of the symbol named
+        `symbols[i]` is at position `i`.
+        """
+        index = {name: i for i, name in enumerate(symbols)}
+        try:
+            return eval(f"lambda v: {self.expression(index)}",
+                        {"__builtins__": {}})
+        except (SyntaxError, RecursionError, MemoryError):
+            # Too deeply nested for the parser; evaluate the tree instead
+            return lambda v: self.evaluate(dict(zip(symbols, v)))
+
+    def partial_expression(self, index):
+        """
+        Returns a Python expression that evaluates the logical sentence on
+        a partial model `v`, a sequence holding FALSE, UNKNOWN or TRUE for
+        each symbol at its position in `index`. The expression is FALSE or
+        TRUE if the sentence has that value whatever the unknown symbols
+        are, and UNKNOWN otherwise.
+        """
+        raise Exception("nothing to evaluate")
+
+    def compile_partial(self, symbols):
+        """
+        Returns a function that evaluates the logical sentence on a partial
+        model, where the value of the symbol named `symbols[i]` is at
+        position `i`.
+        """
+        index = {name: i for i, name in enumerate(symbols)}
+        return eval(f"lambda v: {self.partial_expression(index)}", {
+            "__builtins__": {}, "min": min, "max": max,
+            "iff": _iff, "between": _between,
+        })
+
+    def table(self, tables, full):
+        """
+        Returns an integer whose bit `m` is set when the logical sentence
+        is true in model `m`, where `tables` maps each symbol name to such
+        an integer for that symbol and `full` has a bit set for each model.
+        """
+        raise Exception("nothing to evaluate")
 
     @classmethod
     def validate(cls, sentence):
@@ -44,14 +201,26 @@ class Sentence():
 
 class Symbol(Sentence):
 
-    def __init__(self, name):
-        self.name = name
+    __slots__ = ("name",)
+
+    def __new__(cls, name):
+        return cls.share(name)
+
+    def _setup(self, name):
+        object.__setattr__(self, "name", name)
 
     def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+        return self is other or (
+            isinstance(other, Symbol) and self.name == other.name
+        )
 
     def __hash__(self):
-        return hash(("symbol", self.name))
+        if self._hash is None:
+            self._hash = hash(("symbol", self.name))
+        return self._hash
+
+    def __reduce__(self):
+        return (Symbol, (self.name,))
 
     def __repr__(self):
         return self.name
@@ -65,20 +234,53 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def expression(self, index):
+        try:
+            return f"v[{index[self.name]}]"
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
+    def partial_expression(self, index):
+        return self.expression(index)
+
+    def table(self, tables, full):
+        try:
+            return tables[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
+    def symbol_set(self):
+        if self._symbols is None:
+            self._symbols = frozenset([self.name])
+        return self._symbols
 
 
 class Not(Sentence):
-    def __init__(self, operand):
+
+    __slots__ = ("operand",)
+
+    def __new__(cls, operand):
         Sentence.validate(operand)
-        self.operand = operand
+        return cls.share(operand)
+
+    def _setup(self, operand):
+        object.__setattr__(self, "operand", operand)
+
+    def children(self):
+        return (self.operand,)
 
     def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+        return self is other or (
+            isinstance(other, Not) and self.operand == other.operand
+        )
 
     def __hash__(self):
-        return hash(("not", hash(self.operand)))
+        if self._hash is None:
+            value = hash(("not", hash(self.operand)))
+            if not self.cacheable():
+                return value
+            self._hash = value
+        return self._hash
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -89,23 +291,53 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    def expression(self, index):
+        return f"(not {self.operand.expression(index)})"
+
+    def partial_expression(self, index):
+        return f"({TRUE} - {self.operand.partial_expression(index)})"
+
+    def table(self, tables, full):
+        return full ^ self.operand.table(tables, full)
 
 
 class And(Sentence):
+
+    # Conjunctions can grow with `add`, so they are never shared, and only
+    # cache their hash and symbols until they change
+    __slots__ = ("conjuncts", "_stable")
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
+        self.frozen = False
+        self._hash = None
+        self._symbols = None
+        self._stable = all(
+            getattr(conjunct, "frozen", False) for conjunct in conjuncts
+        )
+
+    def children(self):
+        return tuple(self.conjuncts)
+
+    def cacheable(self):
+        return self._stable
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And) and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+        if self._hash is None:
+            value = hash(
+                ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
+            )
+            if not self.cacheable():
+                return value
+            self._hash = value
+        return self._hash
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -116,33 +348,73 @@ class And(Sentence):
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
+        self._stable = self._stable and getattr(conjunct, "frozen", False)
+        self._hash = None
+        self._symbols = None
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def expression(self, index):
+        if not self.conjuncts:
+            return "True"
+        return "(" + " and ".join(
+            conjunct.expression(index) for conjunct in self.conjuncts
+        ) + ")"
+
+    def partial_expression(self, index):
+        if not self.conjuncts:
+            return str(TRUE)
+        if len(self.conjuncts) == 1:
+            return self.conjuncts[0].partial_expression(index)
+        return "min(" + ", ".join(
+            conjunct.partial_expression(index) for conjunct in self.conjuncts
+        ) + ")"
+
+    def table(self, tables, full):
+        result = full
+        for conjunct in self.conjuncts:
+            result &= conjunct.table(tables, full)
+        return result
+
     def formula(self):
+        if not self.conjuncts:
+            return "⊤"
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
-
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls.share(*disjuncts)
+
+    def _setup(self, *disjuncts):
+        object.__setattr__(self, "disjuncts", disjuncts)
+
+    def children(self):
+        return self.disjuncts
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (
+            isinstance(other, Or) and self.disjuncts == other.disjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+        if self._hash is None:
+            value = hash(
+                ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
+            )
+            if not self.cacheable():
+                return value
+            self._hash = value
+        return self._hash
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -151,30 +423,69 @@ class Or(Sentence):
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def expression(self, index):
+        if not self.disjuncts:
+            return "False"
+        return "(" + " or ".join(
+            disjunct.expression(index) for disjunct in self.disjuncts
+        ) + ")"
+
+    def partial_expression(self, index):
+        if not self.disjuncts:
+            return str(FALSE)
+        if len(self.disjuncts) == 1:
+            return self.disjuncts[0].partial_expression(index)
+        return "max(" + ", ".join(
+            disjunct.partial_expression(index) for disjunct in self.disjuncts
+        ) + ")"
+
+    def table(self, tables, full):
+        result = 0
+        for disjunct in self.disjuncts:
+            result |= disjunct.table(tables, full)
+        return result
+
     def formula(self):
+        if not self.disjuncts:
+            return "⊥"
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
-
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls.share(antecedent, consequent)
+
+    def _setup(self, antecedent, consequent):
+        object.__setattr__(self, "antecedent", antecedent)
+        object.__setattr__(self, "consequent", consequent)
+
+    def children(self):
+        return (self.antecedent, self.consequent)
 
     def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        return self is other or (
+            isinstance(other, Implication)
+            and self.antecedent == other.antecedent
+            and self.consequent == other.consequent
+        )
 
     def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+        if self._hash is None:
+            value = hash(
+                ("implies", hash(self.antecedent), hash(self.consequent))
+            )
+            if not self.cacheable():
+                return value
+            self._hash = value
+        return self._hash
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -183,29 +494,56 @@ class Implication(Sentence):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def expression(self, index):
+        antecedent = self.antecedent.expression(index)
+        consequent = self.consequent.expression(index)
+        return f"((not {antecedent}) or {consequent})"
+
+    def partial_expression(self, index):
+        antecedent = self.antecedent.partial_expression(index)
+        consequent = self.consequent.partial_expression(index)
+        return f"max({TRUE} - {antecedent}, {consequent})"
+
+    def table(self, tables, full):
+        return ((full ^ self.antecedent.table(tables, full))
+                | self.consequent.table(tables, full))
+
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
-
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls.share(left, right)
+
+    def _setup(self, left, right):
+        object.__setattr__(self, "left", left)
+        object.__setattr__(self, "right", right)
+
+    def children(self):
+        return (self.left, self.right)
 
     def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        return self is other or (
+            isinstance(other, Biconditional)
+            and self.left == other.left
+            and self.right == other.right
+        )
 
     def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+        if self._hash is None:
+            value = hash(("biconditional", hash(self.left), hash(self.right)))
+            if not self.cacheable():
+                return value
+            self._hash = value
+        return self._hash
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -216,48 +554,1773 @@ class Biconditional(Sentence):
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def expression(self, index):
+        left = self.left.expression(index)
+        right = self.right.expression(index)
+        return f"((not {left}) == (not {right}))"
+
+    def partial_expression(self, index):
+        left = self.left.partial_expression(index)
+        right = self.right.partial_expression(index)
+        return f"iff({left}, {right})"
+
+    def table(self, tables, full):
+        return full ^ (self.left.table(tables, full)
+                       ^ self.right.table(tables, full))
+
     def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
 
+class Cardinality(Sentence):
+    """
+    Base class for sentences that are true when the number of operands
+    that are true is at least `lower` and at most `upper`.
+    """
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    __slots__ = ("operands",)
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
+    def children(self):
+        return self.operands
 
-        # If model has an assignment for each symbol
-        if not symbols:
+    def __eq__(self, other):
+        return self is other or (
+            type(self) is type(other)
+            and self.lower == other.lower
+            and self.upper == other.upper
+            and self.operands == other.operands
+        )
 
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
+    def __hash__(self):
+        if self._hash is None:
+            value = hash((
+                "cardinality", self.lower, self.upper,
+                tuple(hash(operand) for operand in self.operands)
+            ))
+            if not self.cacheable():
+                return value
+            self._hash = value
+        return self._hash
+
+    def count(self, model):
+        """Returns the number of operands that are true in `model`."""
+        return sum(1 for operand in self.operands if operand.evaluate(model))
+
+    def evaluate(self, model):
+        return self.lower <= self.count(model) <= self.upper
+
+    def expression(self, index):
+        count = " + ".join(
+            f"({operand.expression(index)})" for operand in self.operands
+        ) or "0"
+        return f"({self.lower} <= ({count}) <= {self.upper})"
+
+    def partial_expression(self, index):
+        values = "".join(
+            f"{operand.partial_expression(index)}, "
+            for operand in self.operands
+        )
+        return f"between({self.lower}, {self.upper}, ({values}))"
+
+    def table(self, tables, full):
+        # counts[j] has a bit set for each model in which exactly j of the
+        # operands so far are true, except that the last counts any more.
+        # If every operand may be true, counting up to the lower bound is
+        # enough.
+        bounded = self.upper < len(self.operands)
+        top = self.upper + 1 if bounded else self.lower
+        if top == 0:
+            return full
+        counts = [full] + [0] * top
+        for operand in self.operands:
+            table = operand.table(tables, full)
+            counts[top] |= counts[top - 1] & table
+            for j in range(top - 1, 0, -1):
+                counts[j] = (counts[j] & ~table) | (counts[j - 1] & table)
+            counts[0] &= ~table
+        result = 0
+        for j in range(self.lower, top if bounded else top + 1):
+            result |= counts[j]
+        return result
+
+    def formula(self):
+        operands = ", ".join(operand.formula() for operand in self.operands)
+        return f"{self.name()}({operands})"
+
+    def name(self):
+        """Returns the name of the constraint, with its bound if it has one."""
+        return type(self).__name__
+
+
+class ExactlyOne(Cardinality):
+
+    __slots__ = ()
+
+    lower = 1
+    upper = 1
+
+    def __new__(cls, *operands):
+        for operand in operands:
+            Sentence.validate(operand)
+        return cls.share(*operands)
+
+    def _setup(self, *operands):
+        object.__setattr__(self, "operands", operands)
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
+    def __repr__(self):
+        operands = ", ".join([str(operand) for operand in self.operands])
+        return f"ExactlyOne({operands})"
+
+
+class AtMostK(Cardinality):
+
+    __slots__ = ("k",)
+
+    lower = 0
+
+    def __new__(cls, k, *operands):
+        for operand in operands:
+            Sentence.validate(operand)
+        return cls.share(k, *operands)
+
+    def _setup(self, k, *operands):
+        object.__setattr__(self, "k", k)
+        object.__setattr__(self, "operands", operands)
+
+    @property
+    def upper(self):
+        return self.k
+
+    def __reduce__(self):
+        return (AtMostK, (self.k,) + self.operands)
+
+    def __repr__(self):
+        operands = ", ".join([str(operand) for operand in self.operands])
+        return f"AtMostK({self.k}, {operands})"
+
+    def name(self):
+        return f"AtMost{self.k}"
+
+
+class AtLeastK(Cardinality):
+
+    __slots__ = ("k",)
+
+    def __new__(cls, k, *operands):
+        for operand in operands:
+            Sentence.validate(operand)
+        return cls.share(k, *operands)
+
+    def _setup(self, k, *operands):
+        object.__setattr__(self, "k", k)
+        object.__setattr__(self, "operands", operands)
 
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
+    @property
+    def lower(self):
+        return self.k
 
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
+    @property
+    def upper(self):
+        return len(self.operands)
 
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+    def __reduce__(self):
+        return (AtLeastK, (self.k,) + self.operands)
 
-    # Get all symbols in both knowledge and query
+    def __repr__(self):
+        operands = ", ".join([str(operand) for operand in self.operands])
+        return f"AtLeastK({self.k}, {operands})"
+
+    def name(self):
+        return f"AtLeast{self.k}"
+
+
+def parse(text):
+    """
+    Returns the sentence written as `text` in the syntax of
+    `Sentence.formula`, where ¬ binds tightest, then ∧, ∨, => and <=>,
+    and ⊤ and ⊥ are true and false.
+
+    Any text between connectives is the name of a symbol, so names must
+    not contain connectives, parentheses or commas.
+    """
+    tokens = [token.strip() for token in TOKENS.split(text)]
+    tokens = [token for token in tokens if token]
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal position
+        token = peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"expected {expected or 'sentence'} "
+                             f"at token {position} of {text!r}")
+        position += 1
+        return token
+
+    def biconditional():
+        sentence = implication()
+        while peek() == "<=>":
+            take()
+            sentence = Biconditional(sentence, implication())
+        return sentence
+
+    def implication():
+        sentence = disjunction()
+        if peek() == "=>":
+            take()
+            return Implication(sentence, implication())
+        return sentence
+
+    def disjunction():
+        disjuncts = [conjunction()]
+        while peek() == "∨":
+            take()
+            disjuncts.append(conjunction())
+        return disjuncts[0] if len(disjuncts) == 1 else Or(*disjuncts)
+
+    def conjunction():
+        conjuncts = [negation()]
+        while peek() == "∧":
+            take()
+            conjuncts.append(negation())
+        return conjuncts[0] if len(conjuncts) == 1 else And(*conjuncts)
+
+    def negation():
+        token = take()
+        if token == "¬":
+            return Not(negation())
+        if token == "(":
+            sentence = biconditional()
+            take(")")
+            return sentence
+        if token == "⊤":
+            return And()
+        if token == "⊥":
+            return Or()
+        if token in ("<=>", "=>", "∨", "∧", ")", ","):
+            raise ValueError(f"unexpected {token!r} "
+                             f"at token {position - 1} of {text!r}")
+        if peek() != "(":
+            return Symbol(token)
+
+        # Cardinality constraints are written like function calls
+        match = CARDINALITIES.fullmatch(token)
+        if match is None:
+            raise ValueError(f"unknown constraint {token!r} in {text!r}")
+        take("(")
+        operands = []
+        while peek() != ")":
+            operands.append(biconditional())
+            if peek() != ")":
+                take(",")
+        take(")")
+        if match.group(1) is not None:
+            return AtMostK(int(match.group(1)), *operands)
+        if match.group(2) is not None:
+            return AtLeastK(int(match.group(2)), *operands)
+        return ExactlyOne(*operands)
+
+    sentence = biconditional()
+    if position != len(tokens):
+        raise ValueError(f"unexpected {tokens[position]!r} "
+                         f"at token {position} of {text!r}")
+    return sentence
+
+
+def read_formulas(path):
+    """
+    Returns the conjunction of the sentences in the file at `path`, one
+    per line in the syntax of `Sentence.formula`, skipping blank lines and
+    lines beginning with #.
+    """
+    knowledge = And()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                knowledge.add(parse(line))
+    return knowledge
+
+
+def write_formulas(path, knowledge):
+    """
+    Writes each conjunct of `knowledge` (or `knowledge` itself, if it is
+    not a conjunction) to the file at `path`, one per line.
+    """
+    if isinstance(knowledge, And):
+        sentences = knowledge.conjuncts
+    else:
+        sentences = [knowledge]
+    with open(path, "w", encoding="utf-8") as f:
+        for sentence in sentences:
+            f.write(sentence.formula() + "\n")
+
+
+def simplify(sentence):
+    """
+    Returns a `Simplification` whose `sentence` is equivalent to `sentence`
+    and no larger, with the sizes of both.
+
+    Nested conjunctions and disjunctions are flattened and their repeated
+    operands removed, double negations are removed, and constants are
+    propagated, where And() is true and Or() is false. Within each
+    conjunction, symbols that are conjuncts or negated conjuncts are
+    substituted into the other conjuncts.
+    """
+    simplified = _simplify(sentence, {})
+    before, after = sentence.size(), simplified.size()
+    if after > before:
+        simplified = sentence
+    return Simplification(simplified, before, simplified.size())
+
+
+def _simplify(sentence, facts):
+    """
+    Returns a sentence equivalent to `sentence` when each symbol named in
+    `facts` has the truth value it maps to.
+    """
+    if isinstance(sentence, Symbol):
+        if sentence.name in facts:
+            return And() if facts[sentence.name] else Or()
+        return sentence
+    if isinstance(sentence, Not):
+        return _negate(_simplify(sentence.operand, facts))
+    if isinstance(sentence, And):
+        return _conjoin(sentence.conjuncts, facts)
+    if isinstance(sentence, Or):
+        return _disjoin([_simplify(disjunct, facts)
+                         for disjunct in sentence.disjuncts])
+    if isinstance(sentence, Implication):
+        antecedent = _simplify(sentence.antecedent, facts)
+        consequent = _simplify(sentence.consequent, facts)
+        if _constant(antecedent) is not None:
+            return consequent if _constant(antecedent) else And()
+        if _constant(consequent) is not None:
+            return And() if _constant(consequent) else _negate(antecedent)
+        if antecedent == consequent:
+            return And()
+        return Implication(antecedent, consequent)
+    if isinstance(sentence, Biconditional):
+        left = _simplify(sentence.left, facts)
+        right = _simplify(sentence.right, facts)
+        if _constant(left) is not None:
+            return right if _constant(left) else _negate(right)
+        if _constant(right) is not None:
+            return left if _constant(right) else _negate(left)
+        if left == right:
+            return And()
+        if left == _negate(right):
+            return Or()
+        return Biconditional(left, right)
+    if isinstance(sentence, Cardinality):
+        return _count(sentence.lower, sentence.upper,
+                      [_simplify(operand, facts)
+                       for operand in sentence.operands])
+    raise Exception("nothing to evaluate")
+
+
+def _constant(sentence):
+    """Returns the truth value of `sentence` if constant, otherwise None."""
+    if isinstance(sentence, And) and not sentence.conjuncts:
+        return True
+    if isinstance(sentence, Or) and not sentence.disjuncts:
+        return False
+    return None
+
+
+def _negate(sentence):
+    """Returns a simplified negation of a simplified `sentence`."""
+    if isinstance(sentence, Not):
+        return sentence.operand
+    if _constant(sentence) is not None:
+        return Or() if _constant(sentence) else And()
+    return Not(sentence)
+
+
+def _conjoin(conjuncts, facts):
+    """
+    Returns a simplified conjunction of `conjuncts`, substituting the
+    truth values of literals among them into the rest until none is new.
+    """
+    facts = dict(facts)
+    units = {}
+
+    # The operands each conjunct simplifies to, other than literals, and
+    # the conjuncts in which each symbol is left
+    parts = [[conjunct] for conjunct in conjuncts]
+    occurrences = {}
+    pending = range(len(parts))
+    while pending:
+        fixed = {}
+        for i in pending:
+            operands = []
+            for part in parts[i]:
+                part = _simplify(part, facts)
+                if _constant(part) is False:
+                    return Or()
+                if isinstance(part, And):
+                    operands.extend(part.conjuncts)
+                elif _constant(part) is None:
+                    operands.append(part)
+
+            # Literals hold wherever the other conjuncts are evaluated
+            parts[i] = []
+            for operand in operands:
+                if isinstance(operand, Symbol):
+                    name, value = operand.name, True
+                elif (isinstance(operand, Not)
+                        and isinstance(operand.operand, Symbol)):
+                    name, value = operand.operand.name, False
+                else:
+                    parts[i].append(operand)
+                    for name in operand.symbol_set():
+                        occurrences.setdefault(name, set()).add(i)
+                    continue
+                if units.setdefault(name, value) != value:
+                    return Or()
+                if name not in facts:
+                    fixed[name] = value
+
+        # Only conjuncts that mention a newly fixed symbol can change
+        facts.update(fixed)
+        pending = sorted(set().union(
+            *[occurrences.pop(name, ()) for name in fixed]
+        ))
+
+    conjuncts = dict.fromkeys(operand for part in parts for operand in part)
+    if any(_negate(conjunct) in conjuncts for conjunct in conjuncts):
+        return Or()
+    operands = [Symbol(name) if value else Not(Symbol(name))
+                for name, value in units.items()] + list(conjuncts)
+    if len(operands) == 1:
+        return operands[0]
+    return And(*operands)
+
+
+def _disjoin(disjuncts):
+    """Returns a simplified disjunction of simplified `disjuncts`."""
+    operands = []
+    for disjunct in disjuncts:
+        if _constant(disjunct) is True:
+            return And()
+        if isinstance(disjunct, Or):
+            operands.extend(disjunct.disjuncts)
+        elif _constant(disjunct) is None:
+            operands.append(disjunct)
+    operands = dict.fromkeys(operands)
+    if any(_negate(operand) in operands for operand in operands):
+        return And()
+    if len(operands) == 1:
+        return next(iter(operands))
+    return Or(*operands)
+
+
+def _count(lower, upper, operands):
+    """
+    Returns a simplified sentence that is true when at least `lower` and
+    at most `upper` of the simplified `operands` are true.
+    """
+    true = sum(1 for operand in operands if _constant(operand) is True)
+    operands = [operand for operand in operands
+                if _constant(operand) is None]
+    lower = max(lower - true, 0)
+    upper = min(upper - true, len(operands))
+    if lower > upper:
+        return Or()
+    if lower == 0 and upper == len(operands):
+        return And()
+    if lower == upper == 1:
+        return ExactlyOne(*operands)
+    if lower == 0:
+        return AtMostK(upper, *operands)
+    if upper == len(operands):
+        return AtLeastK(lower, *operands)
+    return _conjoin([AtLeastK(lower, *operands),
+                     AtMostK(upper, *operands)], {})
+
+
+def _iff(left, right):
+    """Returns the value of a biconditional of partial values."""
+    if left == UNKNOWN or right == UNKNOWN:
+        return UNKNOWN
+    return TRUE if left == right else FALSE
+
+
+def _between(lower, upper, values):
+    """
+    Returns the value, given partial `values`, of at least `lower` and at
+    most `upper` of them being true.
+    """
+    true = values.count(TRUE)
+    unknown = values.count(UNKNOWN)
+    if true > upper or true + unknown < lower:
+        return FALSE
+    if true >= lower and true + unknown <= upper:
+        return TRUE
+    return UNKNOWN
+
+
+class SymbolTable():
+    """
+    Dense indices for the names of symbols, so that a model can be a
+    bytearray holding the value of the symbol with index `i` at `i`.
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self.indices = {}
+        for name in names:
+            self.index(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.indices
+
+    def index(self, name):
+        """Returns the index of the symbol `name`, adding it if new."""
+        if name not in self.indices:
+            self.indices[name] = len(self.names)
+            self.names.append(name)
+        return self.indices[name]
+
+    def model(self):
+        """Returns a partial model in which every symbol is UNKNOWN."""
+        return bytearray([UNKNOWN]) * len(self.names)
+
+    def assignment(self, model):
+        """
+        Returns a dictionary mapping the name of each symbol that is not
+        UNKNOWN in `model` to its truth value.
+        """
+        return {name: value == TRUE
+                for name, value in zip(self.names, model)
+                if value != UNKNOWN}
+
+
+def model_check(knowledge, query, method="sat"):
+    """
+    Checks if knowledge base entails query.
+
+    `method` is the name of an entry in `BACKENDS`: "sat" searches for a
+    model of knowledge and not query with `Solver`, "enumerate" checks
+    every assignment of truth values to symbols, "parallel" splits those
+    assignments between processes, "bitwise" checks all of them at once,
+    and "bdd" compiles both into a `BDD`.
+    """
+    return BACKENDS[method](knowledge, query)
+
+
+def model_check_many(knowledge, queries, method="sat"):
+    """
+    Returns a list of whether knowledge base entails each of `queries`.
+
+    `method` is the name of an entry in `BACKENDS`. Those in
+    `BATCH_BACKENDS` answer every query in one search, and the others
+    answer each query separately.
+    """
+    queries = list(queries)
+    if method in BATCH_BACKENDS:
+        return BATCH_BACKENDS[method](knowledge, queries)
+    return [model_check(knowledge, query, method) for query in queries]
+
+
+def model_check_many_enumerate(knowledge, queries):
+    """
+    Checks which queries knowledge base entails, in one enumeration of
+    its models.
+
+    As in `model_check_enumerate`, symbols are assigned one at a time,
+    and no further assignments are made once knowledge is false or every
+    query not yet refuted is true whatever the rest.
+    """
+    knowledge = simplify(knowledge).sentence
+    symbols = SymbolTable(ordering(knowledge, *queries))
+    try:
+        partial_knowledge = knowledge.compile_partial(symbols)
+        partial_queries = [query.compile_partial(symbols)
+                           for query in queries]
+    except (SyntaxError, RecursionError, MemoryError):
+        # Too deeply nested for the parser; check each complete model
+        return [_check_models_between(knowledge, query, list(symbols))
+                for query in queries]
+    knowledge = knowledge.compile(symbols)
+    queries = [query.compile(symbols) for query in queries]
+    depth = max(len(symbols) - TAIL, 0)
+    entailed = [True] * len(queries)
+
+    # pending[d] lists the queries that could be false below the node at
+    # depth d - 1 of the trail
+    model = symbols.model()
+    trail = []
+    pending = [list(range(len(queries)))]
+    while any(entailed):
+        known = partial_knowledge(model)
+        if known != FALSE:
+            undecided = []
+            for i in pending[-1]:
+                if not entailed[i]:
+                    continue
+                answer = partial_queries[i](model)
+                if known == TRUE and answer == FALSE:
+                    entailed[i] = False
+                elif answer != TRUE:
+                    undecided.append(i)
+            if undecided and len(trail) < depth:
+                index = len(trail)
+                model[index] = TRUE
+                trail.append(index)
+                pending.append(undecided)
+                continue
+            if undecided:
+                values = [(value == TRUE,) for value in model[:depth]]
+                values += [(True, False)] * (len(symbols) - depth)
+                for complete in itertools.product(*values):
+                    if knowledge(complete):
+                        for i in undecided:
+                            if not queries[i](complete):
+                                entailed[i] = False
+                        undecided = [i for i in undecided if entailed[i]]
+                        if not undecided:
+                            break
+
+        # Assign false to the latest symbol not yet tried both ways
+        while trail and model[trail[-1]] == FALSE:
+            model[trail.pop()] = UNKNOWN
+            pending.pop()
+        if not trail:
+            break
+        model[trail[-1]] = FALSE
+    return entailed
+
+
+def model_check_many_bitwise(knowledge, queries):
+    """
+    Checks which queries knowledge base entails, by evaluating knowledge
+    on every model at once with bitwise operations only once.
+    """
+    symbols = set.union(knowledge.symbols(),
+                        *[query.symbols() for query in queries])
+    tables, full = truth_tables(symbols)
+    models = knowledge.table(tables, full)
+    return [models & ~query.table(tables, full) == 0 for query in queries]
+
+
+def model_check_many_sat(knowledge, queries):
+    """
+    Checks which queries knowledge base entails, with one `KnowledgeBase`.
+    Each model found of knowledge and not a query also refutes every
+    other query false in that model, without another search.
+    """
+    base = KnowledgeBase(knowledge)
+    literals = [base._literal(query) for query in queries]
+    entailed = [None] * len(queries)
+    for i, literal in enumerate(literals):
+        if entailed[i] is not None:
+            continue
+        if not base.solver.solve([-literal]):
+            entailed[i] = True
+            continue
+        model = base.solver.model
+        for j, other in enumerate(literals):
+            if entailed[j] is None and model[abs(other)] != (other > 0):
+                entailed[j] = False
+    return entailed
+
+
+def model_check_many_bdd(knowledge, queries):
+    """
+    Checks which queries knowledge base entails, by compiling knowledge
+    into a binary decision diagram only once.
+    """
+    bdd = BDD(ordering(knowledge, *queries))
+    u = bdd.compile(knowledge)
+    return [bdd.entails(u, query) for query in queries]
+
+
+def model_check_enumerate(knowledge, query):
+    """
+    Checks if knowledge base entails query, by enumerating all models.
+
+    Symbols are assigned one at a time in a single partial model, undone
+    in the reverse order recorded on a trail, and no further assignments
+    are made once knowledge is false or query is true whatever the rest.
+    The last `TAIL` symbols are not worth assigning one at a time, so
+    their models are checked in full.
+    """
+    knowledge = simplify(knowledge).sentence
+    symbols = SymbolTable(ordering(knowledge, query))
+    try:
+        partial_knowledge = knowledge.compile_partial(symbols)
+        partial_query = query.compile_partial(symbols)
+    except (SyntaxError, RecursionError, MemoryError):
+        # Too deeply nested for the parser; check each complete model
+        return _check_models_between(knowledge, query, list(symbols))
+    knowledge = knowledge.compile(symbols)
+    query = query.compile(symbols)
+    depth = max(len(symbols) - TAIL, 0)
+
+    model = symbols.model()
+    trail = []
+    while True:
+        # Knowledge base must never be true where query is false
+        known = partial_knowledge(model)
+        if known != FALSE:
+            answer = partial_query(model)
+            if known == TRUE and answer == FALSE:
+                return False
+            if answer != TRUE and len(trail) < depth:
+                index = len(trail)
+                model[index] = TRUE
+                trail.append(index)
+                continue
+            if answer != TRUE:
+                values = [(value == TRUE,) for value in model[:depth]]
+                values += [(True, False)] * (len(symbols) - depth)
+                for complete in itertools.product(*values):
+                    if knowledge(complete) and not query(complete):
+                        return False
+
+        # Assign false to the latest symbol not yet tried both ways
+        while trail and model[trail[-1]] == FALSE:
+            model[trail.pop()] = UNKNOWN
+        if not trail:
+            return True
+        model[trail[-1]] = FALSE
+
+
+def _check_models_between(knowledge, query, symbols):
+    """
+    Checks if knowledge base entails query, by evaluating both on every
+    complete model of `symbols`.
+    """
+    knowledge = knowledge.compile(symbols)
+    query = query.compile(symbols)
+    for model in itertools.product((True, False), repeat=len(symbols)):
+        if knowledge(model) and not query(model):
+            return False
+    return True
+
+
+def model_check_parallel(knowledge, query, processes=None, split=None):
+    """
+    Checks if knowledge base entails query, by enumerating all models in
+    `processes` processes (by default, one per CPU).
+
+    The first `split` symbols are fixed to each of their 2 ** split
+    assignments, and each such sub-problem is checked by one worker. As
+    soon as a worker finds a model of knowledge where query is false, the
+    others stop.
+    """
+    knowledge = simplify(knowledge).sentence
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    if processes is None:
+        processes = os.cpu_count()
+    if split is None:
+        # A few sub-problems per process even out their running times
+        split = (4 * processes - 1).bit_length()
+    split = min(split, len(symbols))
+
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(processes, initializer=_start_checking,
+                             initargs=(knowledge, query, symbols,
+                                       stop)) as executor:
+        futures = [
+            executor.submit(_check_models, prefix)
+            for prefix in itertools.product((True, False), repeat=split)
+        ]
+        for future in as_completed(futures):
+            if future.result() is False:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                return False
+    return True
+
+
+def _start_checking(knowledge, query, symbols, stop):
+    """Compiles knowledge and query once in each worker process."""
+    global _checking
+    _checking = (knowledge.compile(symbols), query.compile(symbols),
+                 len(symbols), stop)
+
+
+def _check_models(prefix):
+    """
+    Returns False if some model beginning with the truth values `prefix`
+    makes the worker's knowledge true and query false, True if none does,
+    and None if asked to stop first.
+    """
+    knowledge, query, size, stop = _checking
+    inner = min(size - len(prefix), CHUNK)
+    outer = size - len(prefix) - inner
+    for middle in itertools.product((True, False), repeat=outer):
+        if stop.is_set():
+            return None
+        values = [(value,) for value in prefix + middle]
+        values += [(True, False)] * inner
+        for model in itertools.product(*values):
+            if knowledge(model) and not query(model):
+                stop.set()
+                return False
+    return True
+
+
+def model_check_bitwise(knowledge, query):
+    """
+    Checks if knowledge base entails query, by evaluating both on every
+    model at once with bitwise operations.
+    """
     symbols = set.union(knowledge.symbols(), query.symbols())
+    tables, full = truth_tables(symbols)
+    return knowledge.table(tables, full) & ~query.table(tables, full) == 0
+
+
+def check_symbols(knowledge, symbols=None):
+    """
+    Checks which symbols knowledge base entails, by evaluating it on every
+    model at once with bitwise operations.
+
+    Returns a dictionary mapping each symbol in `symbols` (by default, all
+    symbols in the knowledge base) to True if the knowledge base entails
+    it, False if it entails its negation, and None otherwise.
+    """
+    if symbols is None:
+        symbols = [Symbol(name) for name in sorted(knowledge.symbols())]
+    names = set.union(knowledge.symbols(), *[s.symbols() for s in symbols])
+    tables, full = truth_tables(names)
+    models = knowledge.table(tables, full)
+
+    results = {}
+    for symbol in symbols:
+        table = symbol.table(tables, full)
+        if models & ~table == 0:
+            results[symbol] = True
+        elif models & table == 0:
+            results[symbol] = False
+        else:
+            results[symbol] = None
+    return results
+
+
+def truth_tables(symbols):
+    """
+    Returns a tuple `(tables, full)` for the 2 ** n models of the n names
+    in `symbols`: `tables` maps each name to an integer whose bit `m` is
+    set when that symbol is true in model `m`, and `full` has all 2 ** n
+    bits set.
+    """
+    symbols = sorted(symbols)
+    size = 1 << len(symbols)
+    tables = {}
+    for i, name in enumerate(symbols):
+        # Alternate runs of 2 ** i clear and set bits, doubled to fill
+        width = 1 << (i + 1)
+        table = ((1 << (width >> 1)) - 1) << (width >> 1)
+        while width < size:
+            table |= table << width
+            width <<= 1
+        tables[name] = table
+    return tables, (1 << size) - 1
+
+
+def model_check_sat(knowledge, query):
+    """
+    Checks if knowledge base entails query, by checking that knowledge
+    and not query is unsatisfiable.
+    """
+    return KnowledgeBase(knowledge).entails(query)
+
+
+def model_check_bdd(knowledge, query):
+    """
+    Checks if knowledge base entails query, by compiling knowledge into a
+    binary decision diagram.
+    """
+    bdd = BDD(ordering(knowledge, query))
+    return bdd.entails(bdd.compile(knowledge), query)
+
+
+def ordering(*sentences):
+    """
+    Returns the names of the symbols in `sentences` in the order that a
+    depth-first traversal first meets them, which keeps symbols that
+    appear together close to each other in a `BDD`.
+    """
+    order = {}
+    seen = set()
+    stack = list(reversed(sentences))
+    while stack:
+        sentence = stack.pop()
+        if isinstance(sentence, Symbol):
+            order.setdefault(sentence.name)
+        elif id(sentence) not in seen:
+            seen.add(id(sentence))
+            stack.extend(reversed(sentence.children()))
+    return list(order)
+
+
+class KnowledgeBase():
+    """
+    Sentences known to be true, kept as clauses in a `Solver` between
+    queries, so that clauses learned while answering one query speed up
+    the next.
+
+    Each query is encoded into the same clauses as a single literal, then
+    answered by solving with that literal assumed true or false, so a
+    series of queries costs little more than one.
+    """
+
+    def __init__(self, *sentences):
+        self.knowledge = And()
+        self.cnf = CNF()
+        self.solver = Solver()
+        self.position = 0
+        for sentence in sentences:
+            self.add(sentence)
+
+    def __repr__(self):
+        return f"KnowledgeBase({self.knowledge})"
+
+    @classmethod
+    def from_cnf(cls, cnf):
+        """
+        Returns a knowledge base of the clauses in `cnf`, such as those
+        read by `CNF.read_dimacs`, without building sentences for them.
+        """
+        knowledge = cls()
+        knowledge.cnf = cnf
+        knowledge._update()
+        return knowledge
+
+    def add(self, sentence):
+        """Adds `sentence` to what is known to be true."""
+        Sentence.validate(sentence)
+        self.knowledge.add(sentence)
+        self.cnf.add(sentence)
+        self._update()
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    def symbols(self):
+        """Returns a set of all symbols in the knowledge base."""
+        return self.knowledge.symbols()
+
+    def consistent(self):
+        """Returns True if every sentence added can be true at once."""
+        return self.solver.solve()
+
+    def entails(self, query):
+        """Returns True if the knowledge base entails `query`."""
+        return not self.solver.solve([-self._literal(query)])
+
+    def consistent_with(self, query):
+        """Returns True if `query` can be true when the knowledge is."""
+        return self.solver.solve([self._literal(query)])
+
+    def _literal(self, query):
+        """Returns a literal that is true exactly when `query` is true."""
+        Sentence.validate(query)
+        literal = self.cnf.encode(query)
+        self._update()
+        return literal
+
+    def _update(self):
+        """Passes clauses added to `cnf` since the last update to `solver`."""
+        for clause in self.cnf.clauses(self.position):
+            self.solver.add_clause(clause)
+        self.position = len(self.cnf.literals)
+
+        # Symbols in no clause still need a value in every model
+        while self.solver.variables < self.cnf.count:
+            self.solver.new_var()
+
+
+class CNF():
+    """
+    Clauses in conjunctive normal form that can be satisfied exactly when
+    every sentence added to them is true.
+
+    Each symbol is mapped to a variable numbered from 1, and each
+    connective is given a new variable defined by a few clauses (the
+    Tseitin encoding), so the clauses grow linearly with the sentences.
+    Connectives applied to the same operands share one variable.
+
+    Clauses are stored one after another in `literals`, an array of
+    integers in which each clause ends with 0, as in the DIMACS format.
+    """
+
+    def __init__(self):
+        self.variables = {}
+        self.names = {}
+        self.count = 0
+        self.literals = array("i")
+        self.size = 0
+        self.definitions = {}
+        self.true = None
+
+    def __len__(self):
+        return self.size
+
+    @classmethod
+    def read_dimacs(cls, path):
+        """
+        Returns the clauses in the DIMACS CNF file at `path`. Variables
+        are named by comment lines "c name <variable> <name>", like those
+        `write_dimacs` writes, and every other variable is named by its
+        number.
+
+        Raises ValueError if the number of clauses differs from the one
+        given by the "p cnf" line.
+        """
+        cnf = cls()
+        literals = cnf.literals
+        expected = None
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(NAME):
+                    fields = line[len(NAME):].split(maxsplit=1)
+                    if len(fields) == 2 and fields[0].isdigit():
+                        cnf.names[int(fields[0])] = fields[1].rstrip("\n")
+                elif line.startswith("p "):
+                    fields = line.split()
+                    cnf.count, expected = int(fields[2]), int(fields[3])
+                elif line.startswith("%"):
+                    # Some benchmark files end with "%" and a stray "0"
+                    break
+                elif not line.startswith("c"):
+                    # Clauses already end with 0, as they are stored in
+                    # `literals`, but may span lines
+                    for literal in map(int, line.split()):
+                        literals.append(literal)
+                        cnf.size += not literal
+        if literals and literals[-1]:
+            literals.append(0)
+            cnf.size += 1
+        if expected is not None and cnf.size != expected:
+            raise ValueError(f"expected {expected} clauses in {path!r}, "
+                             f"found {cnf.size}")
+
+        cnf.count = max(cnf.count, max(map(abs, cnf.literals), default=0))
+        cnf.variables = {name: variable
+                         for variable, name in cnf.names.items()}
+        for variable in range(1, cnf.count + 1):
+            name = str(variable)
+            if variable not in cnf.names and name not in cnf.variables:
+                cnf.names[variable] = name
+                cnf.variables[name] = variable
+        return cnf
+
+    def write_dimacs(self, path):
+        """
+        Writes the clauses to the file at `path` in DIMACS CNF format,
+        with a comment line naming each variable that stands for a symbol.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for variable, name in sorted(self.names.items()):
+                f.write(f"{NAME}{variable} {name}\n")
+            f.write(f"p cnf {self.count} {self.size}\n")
+            if self.literals:
+                text = " ".join(map(str, self.literals))
+                f.write(text.replace(" 0 ", " 0\n") + "\n")
+
+    def var(self, name):
+        """Returns the variable for the symbol `name`, creating it if new."""
+        if name not in self.variables:
+            self.variables[name] = self.new_var()
+            self.names[self.variables[name]] = name
+        return self.variables[name]
+
+    def new_var(self):
+        """Returns a new variable that does not stand for any symbol."""
+        self.count += 1
+        return self.count
+
+    def add_clause(self, literals):
+        """Adds a clause, given as an iterable of literals."""
+        self.literals.extend(literals)
+        self.literals.append(0)
+        self.size += 1
+
+    def clauses(self, start=0):
+        """
+        Yields each clause as a list of literals, beginning at position
+        `start` of `literals`.
+        """
+        literals = self.literals
+        end = len(literals)
+        while start < end:
+            stop = literals.index(0, start)
+            yield literals[start:stop].tolist()
+            start = stop + 1
+
+    def add(self, sentence):
+        """Adds clauses that hold exactly when `sentence` is true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.add_clause(set(
+                self.encode(disjunct) for disjunct in sentence.disjuncts
+            ))
+        elif isinstance(sentence, Implication):
+            self.add_clause({-self.encode(sentence.antecedent),
+                             self.encode(sentence.consequent)})
+        elif isinstance(sentence, Not) and isinstance(sentence.operand, Not):
+            self.add(sentence.operand.operand)
+        elif isinstance(sentence, Not) and isinstance(sentence.operand, Or):
+            for disjunct in sentence.operand.disjuncts:
+                self.add(Not(disjunct))
+        elif isinstance(sentence, Not) and isinstance(sentence.operand, And):
+            self.add_clause(set(
+                -self.encode(conjunct) for conjunct in sentence.operand.conjuncts
+            ))
+        else:
+            self.add_clause([self.encode(sentence)])
+
+    def encode(self, sentence):
+        """Returns a literal that is true exactly when `sentence` is true."""
+        if isinstance(sentence, Symbol):
+            return self.var(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.encode(sentence.operand)
+        if isinstance(sentence, And):
+            return self._conjunction(
+                [self.encode(conjunct) for conjunct in sentence.conjuncts]
+            )
+        if isinstance(sentence, Or):
+            return -self._conjunction(
+                [-self.encode(disjunct) for disjunct in sentence.disjuncts]
+            )
+        if isinstance(sentence, Implication):
+            return -self._conjunction([self.encode(sentence.antecedent),
+                                       -self.encode(sentence.consequent)])
+        if isinstance(sentence, Biconditional):
+            return self._equivalence(self.encode(sentence.left),
+                                     self.encode(sentence.right))
+        if isinstance(sentence, Cardinality):
+            literals = [self.encode(operand) for operand in sentence.operands]
+            if sentence.lower > len(literals):
+                return -self._constant()
+            if sentence.upper >= len(literals):
+                return self._counter(literals, sentence.lower)[sentence.lower]
+            counts = self._counter(literals, sentence.upper + 1)
+            return self._conjunction([counts[sentence.lower],
+                                      -counts[sentence.upper + 1]])
+        raise Exception("nothing to evaluate")
+
+    def _constant(self):
+        """Returns a literal that is always true."""
+        if self.true is None:
+            self.true = self.new_var()
+            self.add_clause([self.true])
+        return self.true
+
+    def _conjunction(self, operands):
+        """Returns a literal defined as the conjunction of `operands`."""
+        operands = set(operands)
+        if self.true is not None:
+            if -self.true in operands:
+                return -self.true
+            operands.discard(self.true)
+        if any(-operand in operands for operand in operands):
+            return -self._constant()
+        operands = sorted(operands, key=abs)
+        if not operands:
+            return self._constant()
+        if len(operands) == 1:
+            return operands[0]
+        key = ("and", tuple(operands))
+        if key not in self.definitions:
+            result = self.new_var()
+            for operand in operands:
+                self.add_clause([-result, operand])
+            self.add_clause([result] + [-operand for operand in operands])
+            self.definitions[key] = result
+        return self.definitions[key]
+
+    def _counter(self, literals, bound):
+        """
+        Returns a list of literals whose item `j` is true exactly when at
+        least `j` of `literals` are true, for each `j` up to `bound`.
+
+        The literals are defined by a sequential counter: at least `j` of
+        the first `i` are true when at least `j` of the first `i - 1` are,
+        or at least `j - 1` of them are and the `i`th is true.
+        """
+        true = self._constant()
+        counts = [true] + [-true] * bound
+        for literal in literals:
+            for j in range(bound, 0, -1):
+                counts[j] = -self._conjunction([
+                    -counts[j], -self._conjunction([counts[j - 1], literal])
+                ])
+        return counts
+
+    def _equivalence(self, left, right):
+        """Returns a literal defined as true when `left` equals `right`."""
+        if left == right:
+            return self._constant()
+        if left == -right:
+            return -self._constant()
+
+        # Negating either side negates the equivalence
+        sign = 1
+        if left < 0:
+            left, sign = -left, -sign
+        if right < 0:
+            right, sign = -right, -sign
+        key = ("iff", min(left, right), max(left, right))
+        if key not in self.definitions:
+            result = self.new_var()
+            self.add_clause([-result, -left, right])
+            self.add_clause([-result, left, -right])
+            self.add_clause([result, left, right])
+            self.add_clause([result, -left, -right])
+            self.definitions[key] = result
+        return sign * self.definitions[key]
+
+
+class Solver():
+    """
+    Conflict-driven clause learning SAT solver.
+
+    Variables are positive integers, and literals are nonzero integers:
+    `v` is true when variable `v` is true and `-v` when it is false.
+    Each clause watches its first two literals, learns a clause from each
+    conflict, and search restarts on the Luby sequence.
+    """
+
+    RESTART = 100
+    DECAY = 0.95
+
+    def __init__(self):
+        self.variables = 0
+        self.clauses = []
+        self.learnts = []
+        self.consistent = True
+        self.model = None
+
+        # Indexed by variable
+        self.value = [0]
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.phase = [False]
+
+        # Indexed by 2 * variable + (literal < 0)
+        self.watches = [[], []]
+
+        self.trail = []
+        self.limits = []
+        self.head = 0
+        self.increment = 1.0
+        self.order = []
+
+    def new_var(self):
+        """Adds a new variable and returns it."""
+        self.variables += 1
+        self.value.append(0)
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(False)
+        self.watches.append([])
+        self.watches.append([])
+        heapq.heappush(self.order, (-0.0, self.variables))
+        return self.variables
+
+    def add_clause(self, literals):
+        """
+        Adds a clause, given as an iterable of literals, creating any new
+        variables it mentions. Returns False if the clauses are now known
+        to be unsatisfiable.
+        """
+        if not self.consistent:
+            return False
+        self._backtrack(0)
+        literals = set(literals)
+        while max(map(abs, literals), default=0) > self.variables:
+            self.new_var()
+        clause = []
+        for literal in literals:
+            if -literal in clause or self._literal_value(literal) == 1:
+                return True
+            if self._literal_value(literal) == 0:
+                clause.append(literal)
+
+        if not clause:
+            self.consistent = False
+        elif len(clause) == 1:
+            self._assign(clause[0], None)
+            if self._propagate() is not None:
+                self.consistent = False
+        else:
+            self.clauses.append(clause)
+            self._watch(clause)
+        return self.consistent
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses are satisfiable with every literal in
+        `assumptions` true, storing a satisfying assignment in `model` as
+        a list indexed by variable; returns False otherwise.
+        """
+        self.model = None
+        if not self.consistent:
+            return False
+        self._backtrack(0)
+        assumptions = list(assumptions)
+        for literal in assumptions:
+            while abs(literal) > self.variables:
+                self.new_var()
+
+        restarts = 0
+        conflicts = 0
+        budget = self.RESTART * _luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                conflicts += 1
+                if not self.limits:
+                    self.consistent = False
+                    return False
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self._watch(learnt)
+                    self._assign(learnt[0], learnt)
+                self.increment /= self.DECAY
+                continue
+
+            if conflicts >= budget:
+                restarts += 1
+                conflicts = 0
+                budget = self.RESTART * _luby(restarts)
+                self._backtrack(0)
+                continue
+
+            # Assumptions are decided first, one per decision level
+            level = len(self.limits)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                value = self._literal_value(literal)
+                if value == -1:
+                    self._backtrack(0)
+                    return False
+                self.limits.append(len(self.trail))
+                if value == 0:
+                    self._assign(literal, None)
+                continue
+
+            variable = self._pick()
+            if variable is None:
+                self.model = [value == 1 for value in self.value]
+                self._backtrack(0)
+                return True
+            self.limits.append(len(self.trail))
+            self._assign(variable if self.phase[variable] else -variable,
+                         None)
+
+    def _literal_value(self, literal):
+        if literal > 0:
+            return self.value[literal]
+        return -self.value[-literal]
+
+    def _watch(self, clause):
+        for literal in clause[:2]:
+            self.watches[2 * abs(literal) + (literal < 0)].append(clause)
+
+    def _assign(self, literal, reason):
+        variable = abs(literal)
+        self.value[variable] = 1 if literal > 0 else -1
+        self.level[variable] = len(self.limits)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """
+        Assigns every literal implied by the clauses, and returns a clause
+        made false by the assignment, or None.
+        """
+        value = self.value
+        watches = self.watches
+        trail = self.trail
+        while self.head < len(trail):
+            false = -trail[self.head]
+            self.head += 1
+            watching = watches[2 * abs(false) + (false < 0)]
+            i = j = 0
+            while i < len(watching):
+                clause = watching[i]
+                i += 1
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                first = clause[0]
+                first_value = value[first] if first > 0 else -value[-first]
+                if first_value == 1:
+                    watching[j] = clause
+                    j += 1
+                    continue
+
+                # Look for another literal to watch
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if (value[literal] if literal > 0
+                            else -value[-literal]) != -1:
+                        clause[1], clause[k] = literal, false
+                        watches[2 * abs(literal) + (literal < 0)].append(
+                            clause
+                        )
+                        break
+                else:
+                    watching[j] = clause
+                    j += 1
+                    if first_value == -1:
+                        watching[j:] = watching[i:]
+                        self.head = len(trail)
+                        return clause
+                    self._assign(first, clause)
+            del watching[j:]
+        return None
+
+    def _analyze(self, conflict):
+        """
+        Returns a clause learned from `conflict` whose first literal is
+        implied after backtracking, and the level to backtrack to.
+        """
+        level = len(self.limits)
+        learnt = [None]
+        seen = set()
+        pending = 0
+        index = len(self.trail) - 1
+        clause = conflict
+        literal = None
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.level[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if self.level[variable] == level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+
+            # Resolve on the most recent literal involved in the conflict
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reason[abs(literal)]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+        deepest = max(range(1, len(learnt)),
+                      key=lambda k: self.level[abs(learnt[k])])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self.order = [
+                (-self.activity[v], v) for v in range(1, self.variables + 1)
+                if self.value[v] == 0
+            ]
+            heapq.heapify(self.order)
+
+    def _pick(self):
+        """Returns the unassigned variable with highest activity, or None."""
+        while self.order:
+            activity, variable = heapq.heappop(self.order)
+            if self.value[variable] == 0 and -activity == \
+                    self.activity[variable]:
+                return variable
+        return None
+
+    def _backtrack(self, level):
+        """Undoes every assignment made above decision `level`."""
+        if len(self.limits) <= level:
+            return
+        start = self.limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phase[variable] = literal > 0
+            self.value[variable] = 0
+            self.reason[variable] = None
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.limits[level:]
+        self.head = min(self.head, start)
+
+
+def _luby(i):
+    """Returns the `i`th term (from 0) of the Luby sequence 1 1 2 1 1 2 4..."""
+    size, power = 1, 0
+    while size < i + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) // 2
+        power -= 1
+        i = i % size
+    return 2 ** power
+
+
+class BDD():
+    """
+    Reduced ordered binary decision diagram, in which every sentence is
+    compiled to a node and equivalent sentences to the same node.
+
+    Nodes are integers: 0 is false, 1 is true, and any other node `u`
+    tests the symbol at position `level` of `order`, where `nodes[u]` is
+    `(level, low, high)` and `low` and `high` are the nodes to follow
+    when the symbol is false and true. A unique table keeps one node for
+    each `(level, low, high)` and results of `ite` are cached, so once a
+    sentence is compiled, counting, conditioning and entailment take time
+    linear in the size of its diagram.
+    """
+
+    def __init__(self, order=()):
+        self.order = []
+        self.levels = {}
+        self.nodes = [None, None]
+        self.unique = {}
+        self.cache = {}
+        self.compiled = {}
+        for name in order:
+            self.var(name)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def var(self, name):
+        """Returns the node for the symbol `name`, ordering it last if new."""
+        if name not in self.levels:
+            self.levels[name] = len(self.order)
+            self.order.append(name)
+        return self.node(self.levels[name], 0, 1)
+
+    def level(self, u):
+        """Returns the position in `order` of the symbol node `u` tests."""
+        if u < 2:
+            return len(self.order)
+        return self.nodes[u][0]
+
+    def node(self, level, low, high):
+        """Returns the node testing symbol `level`, creating it if new."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self.unique.get(key)
+        if u is None:
+            u = len(self.nodes)
+            self.nodes.append(key)
+            self.unique[key] = u
+        return u
+
+    def ite(self, f, g, h):
+        """Returns the node for "if `f` then `g` else `h`"."""
+        if f == 1:
+            return g
+        if f == 0:
+            return h
+        if g == h:
+            return g
+        if g == 1 and h == 0:
+            return f
+        key = (f, g, h)
+        u = self.cache.get(key)
+        if u is None:
+            level = min(self.level(f), self.level(g), self.level(h))
+            f0, f1 = self._cofactors(f, level)
+            g0, g1 = self._cofactors(g, level)
+            h0, h1 = self._cofactors(h, level)
+            u = self.node(level, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+            self.cache[key] = u
+        return u
+
+    def _cofactors(self, u, level):
+        """Returns the nodes for `u` with symbol `level` false and true."""
+        if u > 1 and self.nodes[u][0] == level:
+            return self.nodes[u][1], self.nodes[u][2]
+        return u, u
+
+    def compile(self, sentence):
+        """Returns the node that is true exactly when `sentence` is true."""
+        if isinstance(sentence, Symbol):
+            return self.var(sentence.name)
+
+        # Sentences that cannot change are only compiled once
+        frozen = getattr(sentence, "frozen", False)
+        if frozen and sentence in self.compiled:
+            return self.compiled[sentence]
+        if isinstance(sentence, Not):
+            u = self.ite(self.compile(sentence.operand), 0, 1)
+        elif isinstance(sentence, And):
+            u = 1
+            for conjunct in sentence.conjuncts:
+                u = self.ite(u, self.compile(conjunct), 0)
+        elif isinstance(sentence, Or):
+            u = 0
+            for disjunct in sentence.disjuncts:
+                u = self.ite(u, 1, self.compile(disjunct))
+        elif isinstance(sentence, Implication):
+            u = self.ite(self.compile(sentence.antecedent),
+                         self.compile(sentence.consequent), 1)
+        elif isinstance(sentence, Biconditional):
+            right = self.compile(sentence.right)
+            u = self.ite(self.compile(sentence.left),
+                         right, self.ite(right, 0, 1))
+        elif isinstance(sentence, Cardinality):
+            # counts[j] is the node for exactly j of the operands so far
+            # being true, except that the last counts any more. If every
+            # operand may be true, counting up to the lower bound is enough.
+            # Operands are added from the last symbol in the order up, so
+            # that each step mostly builds nodes above the counts so far.
+            bounded = sentence.upper < len(sentence.operands)
+            top = sentence.upper + 1 if bounded else sentence.lower
+            operands = [self.compile(operand)
+                        for operand in sentence.operands]
+            operands.sort(key=self.level, reverse=True)
+            counts = [1] + [0] * top
+            for v in operands if top else ():
+                more = self.ite(counts[top - 1], 1, counts[top])
+                counts = (
+                    [self.ite(v, 0, counts[0])]
+                    + [self.ite(v, counts[j - 1], counts[j])
+                       for j in range(1, top)]
+                    + [self.ite(v, more, counts[top])]
+                )
+            u = 0
+            for j in range(sentence.lower, top if bounded else top + 1):
+                u = self.ite(u, 1, counts[j])
+        else:
+            raise Exception("nothing to evaluate")
+        if frozen:
+            self.compiled[sentence] = u
+        return u
+
+    def entails(self, u, query):
+        """Returns True if node `u` entails the sentence `query`."""
+        return self.ite(u, self.compile(query), 1) == 1
+
+    def condition(self, u, name, value):
+        """Returns the node for `u` with the symbol `name` fixed to `value`."""
+        if name not in self.levels:
+            return u
+        fixed = self.levels[name]
+        results = {0: 0, 1: 1}
+        for v in self._reachable(u):
+            level, low, high = self.nodes[v]
+            if level < fixed:
+                results[v] = self.node(level, results[low], results[high])
+            elif level == fixed:
+                results[v] = results[high] if value else results[low]
+            else:
+                results[v] = v
+        return results[u]
+
+    def count(self, u):
+        """Returns the number of models of node `u` over all of `order`."""
+        return self._counts(u)[u] << self.level(u)
+
+    def marginals(self, u):
+        """
+        Returns a dictionary mapping the name of each symbol in `order` to
+        the number of models of node `u` in which that symbol is true.
+        """
+        counts = self._counts(u)
+        reachable = self._reachable(u)
+        flows = dict.fromkeys(reachable, 0)
+        flows[u] = 1 << self.level(u)
+
+        # Models along each edge count towards the symbol the edge decides,
+        # and half of them towards each symbol the edge skips
+        decided = [0] * (len(self.order) + 1)
+        skipped = [0] * (len(self.order) + 1)
+        half = (counts[u] << self.level(u)) // 2
+        skipped[0] += half
+        skipped[self.level(u)] -= half
+        for v in reversed(reachable):
+            level, low, high = self.nodes[v]
+            for child in (low, high):
+                gap = self.level(child) - level - 1
+                models = flows[v] * counts[child] << gap
+                if child == high:
+                    decided[level] += models
+                if gap:
+                    skipped[level + 1] += models // 2
+                    skipped[self.level(child)] -= models // 2
+                if child > 1:
+                    flows[child] += flows[v] << gap
+
+        marginals = {}
+        total = 0
+        for level, name in enumerate(self.order):
+            total += skipped[level]
+            marginals[name] = total + decided[level]
+        return marginals
+
+    def _counts(self, u):
+        """
+        Returns a dictionary mapping each node reachable from `u` to its
+        number of models over the symbols from its own level down.
+        """
+        counts = {0: 0, 1: 1}
+        for v in self._reachable(u):
+            level, low, high = self.nodes[v]
+            counts[v] = ((counts[low] << (self.level(low) - level - 1))
+                         + (counts[high] << (self.level(high) - level - 1)))
+        return counts
+
+    def _reachable(self, u):
+        """
+        Returns the nodes reachable from `u` other than 0 and 1, each after
+        the nodes below it.
+        """
+        seen = set()
+        stack = [u]
+        while stack:
+            v = stack.pop()
+            if v > 1 and v not in seen:
+                seen.add(v)
+                stack.append(self.nodes[v][1])
+                stack.append(self.nodes[v][2])
+
+        # Nodes are created after their children, so have larger numbers
+        return sorted(seen)
+
+
+BACKENDS = {
+    "enumerate": model_check_enumerate,
+    "parallel": model_check_parallel,
+    "bitwise": model_check_bitwise,
+    "sat": model_check_sat,
+    "bdd": model_check_bdd,
+}
+
+BATCH_BACKENDS = {
+    "enumerate": model_check_many_enumerate,
+    "bitwise": model_check_many_bitwise,
+    "sat": model_check_many_sat,
+    "bdd": model_check_many_bdd,
+}
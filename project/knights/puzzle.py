@@ -12,8 +12,7 @@ CKnave = Symbol("C is a Knave")
 # Puzzle 0
 # A says "I am both a knight and a knave."
 knowledge0 = And(
-    Not(And(AKnave, AKnight)),
-    Or(AKnight, AKnave),
+    ExactlyOne(AKnight, AKnave),
     Implication(AKnight, And(AKnight, AKnave)),
     Implication(AKnave, Not(And(AKnave, AKnight)))
 )
@@ -22,10 +21,8 @@ knowledge0 = And(
 # A says "We are both knaves."
 # B says nothing.
 knowledge1 = And(
-    Not(And(AKnave, AKnight)),
-    Not(And(BKnave, BKnight)),
-    Or(AKnight, AKnave),
-    Or(BKnight, BKnave),
+    ExactlyOne(AKnight, AKnave),
+    ExactlyOne(BKnight, BKnave),
     Implication(AKnight, And(AKnave, BKnave)),
     Implication(AKnave, Not(And(AKnave, BKnave)))
 )
@@ -35,10 +32,8 @@ knowledge1 = And(
 # A says "We are the same kind."
 # B says "We are of different kinds."
 knowledge2 = And(
-    Not(And(AKnight, AKnave)),
-    Not(And(BKnight, BKnave)),
-    Or(AKnight, AKnave),
-    Or(BKnight, BKnave),
+    ExactlyOne(AKnight, AKnave),
+    ExactlyOne(BKnight, BKnave),
     Implication(AKnight, And(AKnight, BKnight)),
     Implication(AKnave, Not(And(AKnave, BKnave))),
     Implication(BKnight, And(AKnave, BKnight)),
@@ -52,12 +47,9 @@ knowledge2 = And(
 # B says "C is a knave."
 # C says "A is a knight."
 knowledge3 = And(
-    Not(And(AKnight, AKnave)),
-    Not(And(BKnight, BKnave)),
-    Not(And(CKnight, CKnave)),
-    Or(AKnight, AKnave),
-    Or(BKnight, BKnave),
-    Or(CKnight, CKnave),
+    ExactlyOne(AKnight, AKnave),
+    ExactlyOne(BKnight, BKnave),
+    ExactlyOne(CKnight, CKnave),
     Implication(AKnight, Or(AKnight, AKnave)),
     Implication(AKnave, Not(Or(AKnight, AKnave))),
     Implication(BKnight, And(AKnight, AKnave)),
@@ -84,8 +76,9 @@ def main():
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
-            for symbol in symbols:
-                if model_check(knowledge, symbol):
+            entailed = model_check_many(knowledge, symbols)
+            for symbol, known in zip(symbols, entailed):
+                if known:
                     print(f"    {symbol}")
 
 
@@ -0,0 +1,106 @@
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import pagerank
+
+SAMPLES = 1000000
+TOLERANCE = 1e-10
+CONFIDENCE = 0.999
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python benchmark.py corpus [output]")
+    results = benchmark(sys.argv[1])
+    text = json.dumps(results, indent=4)
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def timed(function, *args, **kwargs):
+    """
+    Call `function` with the given arguments and return a tuple
+    `(result, seconds)`.
+    """
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def benchmark(directory, samples=SAMPLES):
+    """
+    Time each stage of PageRank on the corpus in `directory`, and check
+    that sampling and iteration agree.
+
+    Return a dictionary of results that can be written as JSON.
+    """
+    damping = pagerank.DAMPING
+    stages = {}
+    results = {
+        "corpus": directory,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "damping": damping,
+        "samples": samples,
+        "stages": stages,
+    }
+
+    # Crawling, with and without the link cache
+    (pages, sources, targets), stages["crawl"] = timed(
+        pagerank.crawl_edges, directory
+    )
+    cache = os.path.join(directory, pagerank.CACHE)
+    if os.path.exists(cache):
+        os.remove(cache)
+    _, stages["crawl_cached_cold"] = timed(pagerank.crawl_cached, directory)
+    _, stages["crawl_cached_warm"] = timed(pagerank.crawl_cached, directory)
+    results["pages"] = len(pages)
+    results["links"] = len(targets)
+
+    # Sampling
+    corpus = pagerank.crawl(directory)
+    _, stages["sample"] = timed(
+        pagerank.sample_pagerank, corpus, damping, samples, seed=0
+    )
+    (sampled, errors), stages["sample_parallel"] = timed(
+        pagerank.parallel_sample_pagerank, corpus, damping, samples,
+        seed=0, confidence=CONFIDENCE
+    )
+
+    # Iteration, with every method
+    offsets, targets = pagerank.index_edges(len(pages), sources, targets)
+    methods = {}
+    ranks = {}
+    for method in pagerank.ITERATIONS:
+        ranks[method], convergence = pagerank.iterate_ranks(
+            offsets, targets, damping, tolerance=TOLERANCE, method=method
+        )
+        methods[method] = {
+            "seconds": convergence.seconds,
+            "iterations": convergence.iterations,
+            "bound": convergence.bound,
+        }
+    stages["iterate"] = methods
+
+    # Sampling and iteration should estimate the same ranks
+    sampled = np.array([sampled[page] for page in pages])
+    difference = np.abs(ranks["jacobi"] - sampled)
+    interval = np.array([errors[page] for page in pages])
+    results["agreement"] = {
+        "max_difference": float(difference.max(initial=0)),
+        "within_interval": float(np.mean(difference <= interval)),
+        "confidence": CONFIDENCE,
+    }
+    return results
+
+
+if __name__ == "__main__":
+    main()
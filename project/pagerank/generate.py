@@ -0,0 +1,88 @@
+import os
+import sys
+
+import numpy as np
+
+EXPONENT = 2.1
+DANGLING = 0.1
+MAX_LINKS = 1000
+
+
+def main():
+    if len(sys.argv) not in [3, 4]:
+        sys.exit("Usage: python generate.py directory pages [seed]")
+    directory = sys.argv[1]
+    pages = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) == 4 else None
+    links = generate_corpus(directory, pages, seed=seed)
+    print(f"Wrote {pages} pages with {links} links to {directory}")
+
+
+def generate_links(pages, exponent=EXPONENT, dangling=DANGLING, seed=None):
+    """
+    Return a tuple `(sources, targets)` of arrays describing a random web
+    graph with `pages` pages, where page `sources[k]` links to page
+    `targets[k]`.
+
+    The number of links on a page and the number of links to a page both
+    follow power laws with the given `exponent`. A fraction `dangling` of
+    the pages has no links at all. No page links to itself, and no page
+    links to the same page twice.
+    """
+    rng = np.random.default_rng(seed)
+    degree = np.minimum(rng.zipf(exponent, pages), min(MAX_LINKS, pages - 1))
+    degree[rng.random(pages) < dangling] = 0
+
+    # Pages are picked as targets in proportion to a power-law weight
+    weight = rng.pareto(exponent - 1, pages) + 1
+    cumulative = np.cumsum(weight)
+    sources = np.repeat(np.arange(pages), degree)
+    targets = np.searchsorted(cumulative,
+                              rng.random(len(sources)) * cumulative[-1])
+    targets = np.minimum(targets, pages - 1)
+
+    edges = np.unique(sources * pages + targets)
+    sources, targets = edges // pages, edges % pages
+    kept = sources != targets
+    return sources[kept], targets[kept]
+
+
+def generate_corpus(directory, pages, exponent=EXPONENT, dangling=DANGLING,
+                    seed=None):
+    """
+    Write a random corpus of `pages` HTML pages to `directory`, with links
+    generated by `generate_links`. Return the number of links written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    sources, targets = generate_links(pages, exponent, dangling, seed)
+    offsets = np.searchsorted(sources, np.arange(pages + 1))
+    targets = targets.tolist()
+
+    for page in range(pages):
+        items = "".join(
+            f'            <li><a href="{link}.html">{link}</a></li>\n'
+            for link in targets[offsets[page]:offsets[page + 1]]
+        )
+        with open(os.path.join(directory, f"{page}.html"), "w") as f:
+            f.write(
+                "<!DOCTYPE html>\n"
+                "<html lang=\"en\">\n"
+                "    <head>\n"
+                f"        <title>{page}</title>\n"
+                "    </head>\n"
+                "    <body>\n"
+                f"        <h1>{page}</h1>\n"
+                "\n"
+                "        <div>Links:</div>\n"
+                "        <ul>\n"
+                f"{items}"
+                "        </ul>\n"
+                "    </body>\n"
+                "</html>\n"
+            )
+
+    return len(targets)
+
+
+if __name__ == "__main__":
+    main()
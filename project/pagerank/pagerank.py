@@ -1,17 +1,51 @@
+import bisect
+import heapq
+import mmap
 import os
 import random
 import re
+import statistics
 import sys
+import time
+import zipfile
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
 
 DAMPING = 0.85
 SAMPLES = 10000
+TOLERANCE = 0.001
+WALKERS = 1 << 16
+WALK_LENGTH = 1000
+BURN_IN = 100
+BUFFER = 1 << 22
+BATCHES = 32
+THREADS = 8
+MMAP_SIZE = 1 << 20
+CACHE = ".pagerank-cache.npz"
+BLOCKS = 16
+EXTRAPOLATION = 10
+FREEZE = 0.1
+SWEEP = 10
+EPSILON = 1e-6
+BUCKETS = 256
+BLOCK = 1 << 22
+
+Convergence = namedtuple(
+    "Convergence", ["method", "iterations", "residuals", "seconds", "bound"]
+)
+
+LINK = re.compile(rb"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
 
 random.seed(666)
 
 def main():
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python pagerank.py corpus")
-    corpus = crawl(sys.argv[1])
+    if len(sys.argv) < 2 or sys.argv[2:] not in [[], ["--cache"]]:
+        sys.exit("Usage: python pagerank.py corpus [--cache]")
+    corpus = crawl(sys.argv[1], cache=len(sys.argv) == 3)
     ranks = sample_pagerank(corpus, DAMPING, SAMPLES)
     print(f"PageRank Results from Sampling (n = {SAMPLES})")
     for page in sorted(ranks):
@@ -22,31 +56,191 @@ def main():
         print(f"  {page}: {ranks[page]:.4f}")
 
 
-def crawl(directory):
+def crawl(directory, cache=False):
     """
     Parse a directory of HTML pages and check for links to other pages.
     Return a dictionary where each key is a page, and values are
     a list of all other pages in the corpus that are linked to by the page.
+
+    If `cache` is True, the links are kept in a cache file in `directory`
+    and only files changed since the last crawl are parsed again.
     """
-    pages = dict()
+    if cache:
+        pages, sources, targets = crawl_cached(directory)
+    else:
+        pages, sources, targets = crawl_edges(directory)
+    corpus = {page: set() for page in pages}
+    for source, target in zip(sources.tolist(), targets.tolist()):
+        corpus[pages[source]].add(pages[target])
+    return corpus
 
-    # Extract all links from HTML files
-    for filename in os.listdir(directory):
-        if not filename.endswith(".html"):
-            continue
-        with open(os.path.join(directory, filename)) as f:
-            contents = f.read()
-            links = re.findall(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"", contents)
-            pages[filename] = set(links) - {filename}
-
-    # Only include links to other pages in the corpus
-    for filename in pages:
-        pages[filename] = set(
-            link for link in pages[filename]
-            if link in pages
+
+def crawl_edges(directory, threads=THREADS):
+    """
+    Parse a directory of HTML pages with a pool of `threads` readers.
+
+    Return a tuple `(pages, sources, targets)`, where `pages` is a sorted
+    list of page names and `pages[sources[k]]` links to `pages[targets[k]]`.
+    Only links to other pages in the corpus are kept, and the edges are
+    ordered by source, then target.
+    """
+    pages, chunks = crawl_chunks(directory, threads)
+    sources, targets = zip(*chunks)
+    return pages, np.concatenate(sources), np.concatenate(targets)
+
+
+def crawl_chunks(directory, threads=THREADS, block=BLOCK):
+    """
+    Parse a directory of HTML pages like `crawl_edges`, without holding
+    all of its links in memory.
+
+    Return a tuple `(pages, chunks)`, where `chunks` yields the links as
+    `(sources, targets)` array pairs of about `block` links each, for
+    `write_edges`.
+    """
+    pages = sorted(
+        filename for filename in os.listdir(directory)
+        if filename.endswith(".html")
+    )
+    ids = {page: i for i, page in enumerate(pages)}
+
+    def chunks():
+        sources = array("q")
+        targets = array("q")
+        paths = [os.path.join(directory, page) for page in pages]
+        with ThreadPoolExecutor(threads) as executor:
+            for source, links in enumerate(executor.map(read_links, paths)):
+                linked = sorted(
+                    ids[link] for link in links
+                    if link in ids and ids[link] != source
+                )
+                sources.extend([source] * len(linked))
+                targets.extend(linked)
+                if len(sources) >= block:
+                    yield (np.frombuffer(sources, dtype=np.int64),
+                           np.frombuffer(targets, dtype=np.int64))
+                    sources = array("q")
+                    targets = array("q")
+        yield (np.frombuffer(sources, dtype=np.int64),
+               np.frombuffer(targets, dtype=np.int64))
+
+    return pages, chunks()
+
+
+def read_links(path):
+    """
+    Return the set of all links in the HTML file at `path`.
+    Files of at least `MMAP_SIZE` bytes are memory-mapped rather than read.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_SIZE:
+            return {link.decode() for link in LINK.findall(f.read())}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            return {
+                match.group(1).decode()
+                for match in LINK.finditer(contents)
+            }
+
+
+def crawl_cached(directory, threads=THREADS):
+    """
+    Return the same tuple as `crawl_edges`, reusing the links stored in
+    the `CACHE` file of `directory` for every HTML file whose modification
+    time and size are unchanged. Added and changed files are parsed, and
+    the cache is rewritten if anything differs from it. If the cache
+    cannot be written, the links are still returned.
+    """
+    path = os.path.join(directory, CACHE)
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".html") and entry.is_file():
+                stat = entry.stat()
+                files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    pages = sorted(files)
+    ids = {page: i for i, page in enumerate(pages)}
+    N = len(pages)
+
+    # Raw links of each file, as indices into a table of link names
+    try:
+        with np.load(path) as cached:
+            cached = {key: cached[key] for key in cached.files}
+        cached_files = cached["files"].tolist()
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        cached = None
+        cached_files = []
+
+    reused = np.zeros(len(cached_files), dtype=bool)
+    for k, filename in enumerate(cached_files):
+        reused[k] = (
+            files.get(filename) == (int(cached["mtimes"][k]),
+                                    int(cached["sizes"][k]))
         )
+    fresh = set(pages) - {
+        filename for k, filename in enumerate(cached_files) if reused[k]
+    }
+
+    # Links of unchanged files are translated without leaving NumPy
+    if cached is not None:
+        owner = np.repeat(np.arange(len(cached_files)),
+                          np.diff(cached["offsets"]))
+        kept = reused[owner]
+        file_ids = np.array([ids.get(f, -1) for f in cached_files] or [0],
+                            dtype=np.int64)
+        old_sources = file_ids[owner[kept]]
+        old_names = cached["names"][cached["links"][kept]]
+    else:
+        old_sources = np.zeros(0, dtype=np.int64)
+        old_names = np.zeros(0, dtype=str)
+
+    new_sources = array("q")
+    new_names = []
+    fresh = sorted(fresh)
+    paths = [os.path.join(directory, page) for page in fresh]
+    with ThreadPoolExecutor(threads) as executor:
+        for page, links in zip(fresh, executor.map(read_links, paths)):
+            new_sources.extend([ids[page]] * len(links))
+            new_names.extend(sorted(links))
 
-    return pages
+    raw_sources = np.concatenate(
+        [old_sources, np.frombuffer(new_sources, dtype=np.int64)]
+    )
+    names, links = np.unique(
+        np.concatenate([old_names, np.array(new_names, dtype=str)]),
+        return_inverse=True
+    )
+    links = links.reshape(-1)
+    order = np.lexsort((links, raw_sources))
+    raw_sources, links = raw_sources[order], links[order]
+
+    if fresh or len(cached_files) != N:
+        stats = np.array([files[page] for page in pages] or np.zeros((0, 2)),
+                         dtype=np.int64)
+        offsets = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(np.bincount(raw_sources, minlength=N), out=offsets[1:])
+        temporary = path + ".tmp"
+        try:
+            with open(temporary, "wb") as f:
+                np.savez(
+                    f, files=np.array(pages, dtype=str),
+                    mtimes=stats[:, 0], sizes=stats[:, 1],
+                    offsets=offsets, names=names, links=links
+                )
+            os.replace(temporary, path)
+        except OSError:
+            # The cache is only an optimization, so a read-only or full
+            # directory still gets crawled
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    # Only links to other pages in the corpus are part of the graph
+    name_ids = np.array([ids.get(name, -1) for name in names.tolist()]
+                        or [0], dtype=np.int64)
+    targets = name_ids[links]
+    kept = (targets >= 0) & (targets != raw_sources)
+    return pages, raw_sources[kept], targets[kept]
 
 
 def transition_model(corpus, page, damping_factor):
@@ -78,7 +272,99 @@ def transition_model(corpus, page, damping_factor):
 
 
 
-def sample_pagerank(corpus, damping_factor, n):
+def index_corpus(corpus):
+    """
+    Return a tuple `(pages, offsets, targets)` describing `corpus` with
+    integer arrays.
+
+    `pages` is a sorted list of page names. The pages linked to by
+    `pages[i]` are `targets[offsets[i]:offsets[i + 1]]`, given as indices
+    into `pages`.
+    """
+    pages = sorted(corpus)
+    ids = {page: i for i, page in enumerate(pages)}
+    sources = []
+    targets = []
+    for i, page in enumerate(pages):
+        links = sorted(ids[link] for link in corpus[page])
+        sources.extend([i] * len(links))
+        targets.extend(links)
+    offsets, targets = index_edges(len(pages), sources, targets)
+    return pages, offsets, targets
+
+
+def index_edges(N, sources, targets):
+    """
+    Return a tuple `(offsets, targets)` in the form used by `index_corpus`
+    for the edge list of a graph with `N` pages, where page `sources[k]`
+    links to page `targets[k]`.
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if np.any(sources[1:] < sources[:-1]):
+        order = np.argsort(sources, kind="stable")
+        sources, targets = sources[order], targets[order]
+    offsets = np.zeros(N + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=N), out=offsets[1:])
+    return offsets, targets
+
+
+def sample_visits(offsets, targets, damping_factor, n, rng, walkers=WALKERS):
+    """
+    Return an array counting how often each page is visited by `n` samples
+    of the random surfer.
+
+    The samples are shared among up to `walkers` independent surfers that
+    advance together. Each surfer starts on a page chosen at random and
+    takes `BURN_IN` unrecorded steps before its samples are counted.
+    """
+    N = len(offsets) - 1
+    degree = np.diff(offsets)
+    padded = np.append(targets, 0)
+    follow_scale = 1 / damping_factor if damping_factor > 0 else 0
+    jump_scale = 1 / (1 - damping_factor) if damping_factor < 1 else 0
+
+    def step(position):
+        # One uniform number decides both whether to follow a link
+        # and which page to land on
+        u = rng.random(len(position))
+        deg = degree[position]
+        linked = deg > 0
+        follow = linked & (u < damping_factor)
+        link = (u * follow_scale * deg).astype(np.int64)
+        link += offsets[position]
+        linked_page = padded.take(link, mode="clip")
+
+        # Pages without links jump to any page with probability 1
+        jump = np.where(linked, (u - damping_factor) * jump_scale, u)
+        jump *= N
+        jumped_page = jump.astype(np.int64)
+        np.minimum(jumped_page, N - 1, out=jumped_page)
+        return np.where(follow, linked_page, jumped_page)
+
+    walkers = max(1, min(walkers, n // WALK_LENGTH))
+    position = rng.integers(N, size=walkers)
+    for _ in range(BURN_IN):
+        position = step(position)
+
+    # Buffer visits so the counts are only updated once per block
+    steps = max(1, BUFFER // walkers)
+    buffer = np.empty((steps, walkers), dtype=np.int64)
+    counts = np.zeros(N, dtype=np.int64)
+    recorded = 0
+    while recorded < n:
+        rows = min(steps, -(-(n - recorded) // walkers))
+        for row in range(rows):
+            buffer[row] = position
+            position = step(position)
+        visits = buffer[:rows].ravel()[:n - recorded]
+        counts += np.bincount(visits, minlength=N)
+        recorded += len(visits)
+
+    return counts
+
+
+def sample_pagerank(corpus, damping_factor, n, seed=None, processes=1):
     """
     Return PageRank values for each page by sampling `n` pages
     according to transition model, starting with a page at random.
@@ -86,24 +372,102 @@ def sample_pagerank(corpus, damping_factor, n):
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
+
+    If `seed` is None, the generator is seeded from `random`, so that
+    seeding `random` keeps results reproducible. If `processes` is not 1,
+    the samples are drawn in parallel by `parallel_sample_pagerank`.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    if processes != 1:
+        ranks, _ = parallel_sample_pagerank(
+            corpus, damping_factor, n, seed=seed, processes=processes
+        )
+        return ranks
+    pages, offsets, targets = index_corpus(corpus)
+    counts = sample_visits(offsets, targets, damping_factor, n,
+                           np.random.default_rng(seed))
+    return dict(zip(pages, (counts / n).tolist()))
+
+
+def parallel_sample_pagerank(corpus, damping_factor, n, seed=None,
+                             processes=None, confidence=0.95):
+    """
+    Return PageRank values for each page by sampling `n` pages in
+    `BATCHES` independent batches spread over `processes` worker processes
+    (all available cores if None).
+
+    Return a tuple `(ranks, errors)` of dictionaries keyed by page name,
+    where `errors` gives the half-width of the `confidence` interval of
+    each rank, estimated from the spread between batches. Results depend
+    only on `seed`, not on the number of processes.
     """
-    rank = {key : 0 for key in corpus.keys()}
-    page = random.choice(list(corpus.keys()))
+    if seed is None:
+        seed = random.getrandbits(64)
+    pages, offsets, targets = index_corpus(corpus)
+    N = len(pages)
+    batches = max(1, min(BATCHES, n))
+    sizes = [n // batches + (i < n % batches) for i in range(batches)]
+    seeds = np.random.SeedSequence(seed).spawn(batches)
 
-    for _ in range(n):
-        rank[page] += 1
-        distribution = transition_model(corpus, page, damping_factor)
-        pages = distribution.keys()
-        probability = distribution.values();
-        page = random.choices(list(pages), weights=probability, k=1)[0]
-        
-    for key in rank.keys():
-        rank[key] /= n
+    # Share the graph with the workers instead of pickling it per batch
+    shared = shared_memory.SharedMemory(
+        create=True, size=max(1, offsets.nbytes + targets.nbytes)
+    )
+    try:
+        graph = np.ndarray(len(offsets) + len(targets), dtype=np.int64,
+                           buffer=shared.buf)
+        graph[:len(offsets)] = offsets
+        graph[len(offsets):] = targets
+        del graph
 
-    return rank
+        counts = np.zeros(N, dtype=np.int64)
+        squares = np.zeros(N)
+        with ProcessPoolExecutor(processes) as executor:
+            results = executor.map(
+                _sample_shared_visits,
+                [shared.name] * batches, [N] * batches,
+                [len(targets)] * batches, [damping_factor] * batches,
+                sizes, seeds
+            )
+            for size, visits in zip(sizes, results):
+                counts += visits
+                squares += (visits / size) ** 2
+    finally:
+        shared.close()
+        shared.unlink()
 
+    ranks = counts / n
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    if batches > 1:
+        variance = np.maximum(squares / batches - ranks ** 2, 0)
+        errors = z * np.sqrt(variance / (batches - 1))
+    else:
+        errors = np.full(N, np.inf)
+    return (dict(zip(pages, ranks.tolist())),
+            dict(zip(pages, errors.tolist())))
 
-def iterate_pagerank(corpus, damping_factor):
+
+def _sample_shared_visits(name, N, E, damping_factor, n, seed):
+    """
+    Return the visit counts of `n` samples over the graph with `N` pages
+    and `E` links stored in the shared memory block `name`.
+    """
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        # The block cannot be closed while any view of it is alive
+        graph = np.ndarray(N + 1 + E, dtype=np.int64, buffer=shared.buf)
+        try:
+            return sample_visits(graph[:N + 1], graph[N + 1:], damping_factor,
+                                 n, np.random.default_rng(seed))
+        finally:
+            del graph
+    finally:
+        shared.close()
+
+
+def iterate_pagerank(corpus, damping_factor, method="jacobi",
+                     tolerance=TOLERANCE, directory=None):
     """
     Return PageRank values for each page by iteratively updating
     PageRank values until convergence.
@@ -111,36 +475,518 @@ def iterate_pagerank(corpus, damping_factor):
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
+
+    `method` selects how the iteration is accelerated; see `iterate_ranks`.
+    If `directory` is given, the links are instead written there by
+    `write_edges` and iterated out of core by `iterate_edges`, which only
+    supports the "jacobi" method.
     """
-    rank = {}
-    reversed_link = {}
-    N = len(corpus.keys())
+    if directory is not None:
+        if method != "jacobi":
+            raise ValueError(f"method {method!r} is not supported out of core")
+        pages = sorted(corpus)
+        write_edges(directory, len(pages), corpus_chunks(corpus, pages))
+        rank, _ = iterate_edges(directory, damping_factor, tolerance)
+        return dict(zip(pages, rank.tolist()))
+    pages, offsets, targets = index_corpus(corpus)
+    rank, _ = iterate_ranks(offsets, targets, damping_factor,
+                            tolerance=tolerance, method=method)
+    return dict(zip(pages, rank.tolist()))
 
-    for key in corpus.keys():
-        reversed_link[key] = [] 
-        rank[key] = 1 / N
 
-    for key in corpus.keys():
-        relations = corpus[key]
-        for i in relations:
-            reversed_link[i].append(key)
-    
-    
+def iterate_ranks(offsets, targets, damping_factor, rank=None,
+                  tolerance=TOLERANCE, method="jacobi"):
+    """
+    Iterate the PageRank formula over the graph given by `offsets` and
+    `targets` (see `index_corpus`), starting from `rank` or from the
+    uniform distribution if `rank` is None, until no page changes by
+    `tolerance` or more. A page without links is treated as linking to
+    every page.
+
+    `method` is one of:
+      "jacobi"        update every page from the previous iteration
+      "gauss-seidel"  update pages in `BLOCKS` blocks, each block using
+                      the values already updated by the blocks before it
+      "extrapolation" apply Aitken extrapolation every `EXTRAPOLATION`
+                      iterations
+      "adaptive"      stop updating pages that change by less than
+                      `FREEZE` times `tolerance`, until a full iteration
+                      shows whether they need to be updated again
+
+    Return a tuple `(rank, convergence)`, where `convergence` records the
+    largest change in each iteration, the wall time in seconds, and an
+    upper bound on the L1 distance between `rank` and the exact PageRank.
+    For "adaptive", an iteration that updates only the active pages
+    counts as one, so its iterations are cheaper than those of the other
+    methods and are not comparable with them.
+    """
+    if method not in ITERATIONS:
+        raise ValueError(f"unknown method {method!r}")
+    started = time.perf_counter()
+    N = len(offsets) - 1
+    degree = np.diff(offsets)
+    sources = np.repeat(np.arange(N), degree)
+    dangling = degree == 0
+    inverse = 1 / np.maximum(degree, 1)
+
+    def jacobi(rank):
+        shares = (rank * inverse)[sources]
+        new_rank = damping_factor * np.bincount(targets, weights=shares,
+                                                minlength=N)
+        new_rank += (1 - damping_factor
+                     + damping_factor * rank[dangling].sum()) / N
+        return new_rank
+
+    if rank is None:
+        rank = np.full(N, 1 / N)
+    rank = np.array(rank, dtype=float)
+    residuals = ITERATIONS[method](
+        jacobi, rank, sources, targets, inverse, dangling, damping_factor,
+        tolerance
+    )
+
+    # The change after one more iteration bounds the distance to PageRank
+    bound = np.abs(jacobi(rank) - rank).sum() / (1 - damping_factor) \
+        if damping_factor < 1 else np.inf
+    seconds = time.perf_counter() - started
+    return rank, Convergence(method, len(residuals), residuals, seconds,
+                             float(bound))
+
+
+def _iterate_jacobi(jacobi, rank, sources, targets, inverse, dangling,
+                    damping_factor, tolerance):
+    """
+    Iterate `rank` in place until it converges; return the largest change
+    in each iteration.
+    """
+    residuals = []
     while True:
-        converse = True
-        for key in corpus.keys():
-            copy = rank[key]
-            accumulation = 0  
-            for i in reversed_link[key]:
-                accumulation += damping_factor * rank[i] / len(corpus[i])
-            rank[key] = (1 - damping_factor) / N + accumulation
-            if abs(rank[key] - copy) > 0.001:
-                converse = False
-        if converse:
+        new_rank = jacobi(rank)
+        residuals.append(float(np.abs(new_rank - rank).max(initial=0)))
+        rank[:] = new_rank
+        if residuals[-1] < tolerance:
+            return residuals
+
+
+def _iterate_gauss_seidel(jacobi, rank, sources, targets, inverse, dangling,
+                          damping_factor, tolerance):
+    """
+    Iterate `rank` in place block by block until it converges; return the
+    largest change in each iteration.
+    """
+    N = len(rank)
+
+    # Links grouped by the page they point to
+    order = np.argsort(targets, kind="stable")
+    into = targets[order]
+    from_ = sources[order]
+    bounds = np.linspace(0, N, min(BLOCKS, N) + 1).astype(np.int64)
+    edges = np.searchsorted(into, bounds)
+
+    residuals = []
+    while True:
+        change = 0
+        mass = rank[dangling].sum()
+        for k in range(len(bounds) - 1):
+            start, end = bounds[k], bounds[k + 1]
+            links = slice(edges[k], edges[k + 1])
+            block = damping_factor * np.bincount(
+                into[links] - start,
+                weights=rank[from_[links]] * inverse[from_[links]],
+                minlength=end - start
+            )
+            block += (1 - damping_factor + damping_factor * mass) / N
+            old = rank[start:end]
+            mass += (block - old)[dangling[start:end]].sum()
+            change = max(change, np.abs(block - old).max(initial=0))
+            rank[start:end] = block
+        residuals.append(float(change))
+        if change < tolerance:
+            return residuals
+
+
+def _iterate_extrapolation(jacobi, rank, sources, targets, inverse, dangling,
+                           damping_factor, tolerance):
+    """
+    Iterate `rank` in place with periodic Aitken extrapolation until it
+    converges; return the largest change in each iteration.
+    """
+    residuals = []
+    history = []
+    while True:
+        new_rank = jacobi(rank)
+        residuals.append(float(np.abs(new_rank - rank).max(initial=0)))
+        rank[:] = new_rank
+        if residuals[-1] < tolerance:
+            return residuals
+
+        history = (history + [new_rank])[-3:]
+        if len(residuals) % EXTRAPOLATION == 0 and len(history) == 3:
+            # Componentwise Aitken delta-squared from the last three iterates
+            first, second, third = history
+            step = second - first
+            curvature = third - 2 * second + first
+            usable = np.abs(curvature) > 1e-15
+            extrapolated = third.copy()
+            extrapolated[usable] = (
+                first[usable] - step[usable] ** 2 / curvature[usable]
+            )
+            np.maximum(extrapolated, 0, out=extrapolated)
+            extrapolated /= extrapolated.sum()
+
+            # Keep the extrapolation only if it iterates to a smaller change
+            new_rank = jacobi(extrapolated)
+            change = float(np.abs(new_rank - extrapolated).max(initial=0))
+            if change < residuals[-1]:
+                residuals.append(change)
+                rank[:] = new_rank
+                if change < tolerance:
+                    return residuals
+            history = []
+
+
+def _iterate_adaptive(jacobi, rank, sources, targets, inverse, dangling,
+                      damping_factor, tolerance):
+    """
+    Iterate `rank` in place, updating only pages that have not converged,
+    until it converges; return the largest change in each iteration,
+    whether it updated every page or only the active ones.
+    Every page is updated again every `SWEEP` iterations, and whenever
+    most pages are still active.
+    """
+    N = len(rank)
+    order = np.argsort(targets, kind="stable")
+    into = targets[order]
+    from_ = sources[order]
+    first = np.searchsorted(into, np.arange(N + 1))
+    active = np.ones(N, dtype=bool)
+
+    residuals = []
+    while True:
+        pages = np.flatnonzero(active)
+        if (len(pages) == 0 or 2 * len(pages) > N
+                or len(residuals) % SWEEP == 0):
+            # A full iteration checks every page, including frozen ones
+            new_rank = jacobi(rank)
+            change = np.abs(new_rank - rank)
+            residuals.append(float(change.max(initial=0)))
+            rank[:] = new_rank
+            if residuals[-1] < tolerance:
+                return residuals
+            active = change >= FREEZE * tolerance
+            continue
+
+        # Gather the links into the active pages only
+        counts = first[pages + 1] - first[pages]
+        links = np.repeat(first[pages] - np.cumsum(counts) + counts, counts)
+        links += np.arange(len(links))
+        shares = from_[links]
+        updated = damping_factor * np.bincount(
+            np.repeat(np.arange(len(pages)), counts),
+            weights=rank[shares] * inverse[shares],
+            minlength=len(pages)
+        )
+        updated += (1 - damping_factor
+                    + damping_factor * rank[dangling].sum()) / N
+        change = np.abs(updated - rank[pages])
+        residuals.append(float(change.max(initial=0)))
+        rank[pages] = updated
+        active[pages] = change >= FREEZE * tolerance
+
+
+ITERATIONS = {
+    "jacobi": _iterate_jacobi,
+    "gauss-seidel": _iterate_gauss_seidel,
+    "extrapolation": _iterate_extrapolation,
+    "adaptive": _iterate_adaptive,
+}
+
+
+def update_pagerank(corpus, ranks, damping_factor, added=(), removed=(),
+                    push=False, tolerance=TOLERANCE):
+    """
+    Return PageRank values after editing the links of `corpus`, starting
+    from `ranks`, the PageRank values of `corpus` before the edit.
+
+    `added` and `removed` are iterables of `(page, link)` pairs between
+    pages already in `corpus`, which is not modified. If `push` is True,
+    the change in the PageRank equations caused by the edit is first
+    pushed through the graph from the affected pages only, before
+    iterating to convergence.
+
+    Return a tuple `(corpus, ranks, iterations)` with the edited corpus.
+    """
+    added, removed = list(added), list(removed)
+    edited = {page: set(links) for page, links in corpus.items()}
+    for page, link in added + removed:
+        if page not in edited or link not in edited:
+            raise ValueError(f"link {page} -> {link} is not in the corpus")
+    for page, link in removed:
+        edited[page].discard(link)
+    for page, link in added:
+        if page != link:
+            edited[page].add(link)
+
+    pages, offsets, targets = index_corpus(edited)
+    ids = {page: i for i, page in enumerate(pages)}
+    rank = np.array([ranks[page] for page in pages], dtype=float)
+    rank /= rank.sum()
+
+    if push and damping_factor < 1:
+        changed = {page for page, _ in added} | {page for page, _ in removed}
+        residual = np.zeros(len(pages))
+        for page in changed:
+            share = damping_factor * rank[ids[page]]
+            for links, sign in ((corpus[page], -1), (edited[page], 1)):
+                if links:
+                    for link in links:
+                        residual[ids[link]] += sign * share / len(links)
+                else:
+                    residual += sign * share / len(pages)
+        rank = push_residuals(offsets, targets, damping_factor, rank,
+                              residual, tolerance * (1 - damping_factor))
+
+    rank, convergence = iterate_ranks(offsets, targets, damping_factor, rank,
+                                      tolerance)
+    return edited, dict(zip(pages, rank.tolist())), convergence.iterations
+
+
+def push_residuals(offsets, targets, damping_factor, rank, residual,
+                   threshold):
+    """
+    Return `rank` corrected by pushing `residual` through the graph: a page
+    whose residual exceeds `threshold` adds it to its rank and passes
+    `damping_factor` of it on, split among the pages it links to. Only
+    pages reached by such pushes are visited.
+
+    Residual passed on by pages without links reaches every page equally.
+    It is not pushed, but corrected for at the end using the current ranks
+    in place of the PageRank of the graph, since a residual of 1 / N on
+    every page changes the solution by PageRank / (1 - damping_factor).
+    """
+    N = len(rank)
+    rank = rank.tolist()
+    residual = residual.tolist()
+    uniform = 0
+    queue = deque(i for i in range(N) if abs(residual[i]) > threshold)
+    queued = set(queue)
+
+    while queue:
+        page = queue.popleft()
+        queued.discard(page)
+        amount = residual[page]
+        rank[page] += amount
+        residual[page] = 0
+        start, end = int(offsets[page]), int(offsets[page + 1])
+        if start == end:
+            uniform += damping_factor * amount / N
+            continue
+        share = damping_factor * amount / (end - start)
+        for link in targets[start:end].tolist():
+            residual[link] += share
+            if abs(residual[link]) > threshold and link not in queued:
+                queued.add(link)
+                queue.append(link)
+
+    rank = np.array(rank)
+    return rank + uniform * N / (1 - damping_factor) * rank / rank.sum()
+
+
+def write_edges(directory, N, chunks, buckets=BUCKETS):
+    """
+    Write the links of a graph with `N` pages to memory-mapped files in
+    `directory`, for use by `iterate_edges`.
+
+    `chunks` is an iterable of `(sources, targets)` array pairs, where page
+    `sources[k]` links to page `targets[k]`. The links are sorted by target
+    page with an external bucket sort, so that memory use is bounded by
+    the size of one chunk or of one of `buckets` buckets.
+    """
+    os.makedirs(directory, exist_ok=True)
+    dtype = np.uint32 if N <= 1 << 32 else np.int64
+    degree = np.lib.format.open_memmap(
+        os.path.join(directory, "degree.npy"), mode="w+",
+        dtype=np.int64, shape=(N,)
+    )
+
+    # Scatter the links into buckets of consecutive target pages
+    paths = [os.path.join(directory, f"bucket{k}.tmp") for k in range(buckets)]
+    files = [open(path, "wb") for path in paths]
+    E = 0
+    try:
+        for sources, targets in chunks:
+            sources = np.asarray(sources, dtype=np.int64)
+            targets = np.asarray(targets, dtype=np.int64)
+            pages, counts = np.unique(sources, return_counts=True)
+            degree[pages] += counts
+            bucket = targets * buckets // max(N, 1)
+            order = np.argsort(bucket, kind="stable")
+            ends = np.searchsorted(bucket[order], np.arange(1, buckets + 1))
+            pairs = np.stack([sources[order], targets[order]], axis=1)
+            pairs = pairs.astype(dtype)
+            begin = 0
+            for f, end in zip(files, ends):
+                pairs[begin:end].tofile(f)
+                begin = end
+            E += len(sources)
+    finally:
+        for f in files:
+            f.close()
+    degree.flush()
+    del degree
+
+    # Sort each bucket in memory and append it to the edge arrays
+    sources = np.lib.format.open_memmap(
+        os.path.join(directory, "sources.npy"), mode="w+",
+        dtype=dtype, shape=(E,)
+    )
+    targets = np.lib.format.open_memmap(
+        os.path.join(directory, "targets.npy"), mode="w+",
+        dtype=dtype, shape=(E,)
+    )
+    begin = 0
+    for path in paths:
+        pairs = np.fromfile(path, dtype=dtype).reshape(-1, 2)
+        order = np.argsort(pairs[:, 1], kind="stable")
+        end = begin + len(pairs)
+        sources[begin:end] = pairs[order, 0]
+        targets[begin:end] = pairs[order, 1]
+        begin = end
+        del pairs, order
+        os.remove(path)
+    sources.flush()
+    targets.flush()
+
+
+def corpus_chunks(corpus, pages, block=BLOCK):
+    """
+    Yield the links of `corpus` as `(sources, targets)` array pairs of
+    about `block` links each, as indices into the sorted list `pages`, for
+    `write_edges`.
+    """
+    ids = {page: i for i, page in enumerate(pages)}
+    sources = array("q")
+    targets = array("q")
+    for i, page in enumerate(pages):
+        links = sorted(ids[link] for link in corpus[page])
+        sources.extend([i] * len(links))
+        targets.extend(links)
+        if len(sources) >= block:
+            yield (np.frombuffer(sources, dtype=np.int64),
+                   np.frombuffer(targets, dtype=np.int64))
+            sources = array("q")
+            targets = array("q")
+    yield (np.frombuffer(sources, dtype=np.int64),
+           np.frombuffer(targets, dtype=np.int64))
+
+
+def iterate_edges(directory, damping_factor, tolerance=TOLERANCE,
+                  block=BLOCK):
+    """
+    Iterate the PageRank formula over the links written to `directory` by
+    `write_edges`, reading them in blocks of `block` links, until no page
+    changes by `tolerance` or more.
+
+    Only the rank vectors are held in memory. Return a tuple
+    `(rank, convergence)` as `iterate_ranks` does.
+    """
+    started = time.perf_counter()
+    degree = np.load(os.path.join(directory, "degree.npy"), mmap_mode="r")
+    sources = np.load(os.path.join(directory, "sources.npy"), mmap_mode="r")
+    targets = np.load(os.path.join(directory, "targets.npy"), mmap_mode="r")
+    N = len(degree)
+    E = len(sources)
+
+    rank = np.full(N, 1 / N)
+    share = np.empty(N)
+    residuals = []
+    while True:
+        # Rank passed along each link of a page, read degrees in blocks
+        mass = 0
+        for begin in range(0, N, block):
+            end = min(begin + block, N)
+            deg = degree[begin:end]
+            share[begin:end] = rank[begin:end] / np.maximum(deg, 1)
+            mass += rank[begin:end][deg == 0].sum()
+
+        # Links are sorted by target, so each block fills a range of pages
+        new_rank = np.zeros(N)
+        for begin in range(0, E, block):
+            end = min(begin + block, E)
+            into = targets[begin:end].astype(np.int64)
+            low = into[0]
+            new_rank[low:into[-1] + 1] += np.bincount(
+                into - low, weights=share[sources[begin:end]]
+            )
+        new_rank *= damping_factor
+        new_rank += (1 - damping_factor + damping_factor * mass) / N
+
+        change = np.abs(new_rank - rank)
+        residuals.append(float(change.max(initial=0)))
+        total = change.sum()
+        rank = new_rank
+        if residuals[-1] < tolerance:
             break
 
-    return rank
+    bound = damping_factor * total / (1 - damping_factor) \
+        if damping_factor < 1 else np.inf
+    seconds = time.perf_counter() - started
+    return rank, Convergence("out-of-core", len(residuals), residuals,
+                             seconds, float(bound))
+
+
+def personalized_pagerank(index, seeds, damping_factor, k=10,
+                          epsilon=EPSILON):
+    """
+    Return the `k` pages with the highest PageRank personalized to the
+    pages in `seeds`: the random surfer jumps back to a random seed page,
+    rather than to any page, with probability `1 - damping_factor`, and
+    whenever it reaches a page without links.
+
+    `index` is the tuple returned by `index_corpus`, so that it can be
+    reused across queries. Rank is pushed outwards from the seeds until
+    every page holds less than `epsilon` unpushed rank per link, so only
+    pages near the seeds are visited.
+
+    Return a tuple `(ranks, error)`, where `ranks` is a list of
+    `(page, rank)` pairs in decreasing order of rank, and every computed
+    rank falls short of the exact value by at most `error`.
+    """
+    pages, offsets, targets = index
+    start = []
+    for seed in set(seeds):
+        i = bisect.bisect_left(pages, seed)
+        if i == len(pages) or pages[i] != seed:
+            raise ValueError(f"seed {seed} is not in the corpus")
+        start.append(i)
+    if not start:
+        raise ValueError("at least one seed page is required")
+
+    rank = {}
+    residual = {i: 1 / len(start) for i in start}
+    queue = deque(start)
+    queued = set(start)
+    while queue:
+        page = queue.popleft()
+        queued.discard(page)
+        amount = residual.pop(page)
+        rank[page] = rank.get(page, 0) + (1 - damping_factor) * amount
+        begin, end = int(offsets[page]), int(offsets[page + 1])
+        if begin == end:
+            links = start
+        else:
+            links = targets[begin:end].tolist()
+        share = damping_factor * amount / len(links)
+        for link in links:
+            residual[link] = residual.get(link, 0) + share
+            degree = max(int(offsets[link + 1] - offsets[link]), 1)
+            if residual[link] >= epsilon * degree and link not in queued:
+                queued.add(link)
+                queue.append(link)
 
+    top = heapq.nlargest(k, rank.items(), key=lambda item: item[1])
+    return ([(pages[page], value) for page, value in top],
+            sum(residual.values()))
 
 
 if __name__ == "__main__":